@@ -1,54 +1,322 @@
+import argparse
+import collections
+import json
+import os
+import threading
+import time
+
 import cv2
-import pyautogui
-import pygetwindow as gw
-import win32gui
-import win32con
+import numpy as np
+
+TITLE = "Gerakan Tangan = SPACE"
+MIN_AREA = 10000
+STAGES = ["absdiff", "cvtColor", "GaussianBlur", "threshold", "dilate", "findContours", "filter"]
+
 
-# Inisialisasi kamera
-cap = cv2.VideoCapture(0)
-_, frame1 = cap.read()
-_, frame2 = cap.read()
+def detect_motion(frame1, frame2, timings=None):
+    ticks = [time.perf_counter()]
 
-while True:
     # Hitung perbedaan antar frame
     diff = cv2.absdiff(frame1, frame2)
+    ticks.append(time.perf_counter())
     gray = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
+    ticks.append(time.perf_counter())
     blur = cv2.GaussianBlur(gray, (5, 5), 0)
+    ticks.append(time.perf_counter())
     _, thresh = cv2.threshold(blur, 20, 255, cv2.THRESH_BINARY)
+    ticks.append(time.perf_counter())
     dilated = cv2.dilate(thresh, None, iterations=3)
+    ticks.append(time.perf_counter())
 
     # Deteksi kontur (gerakan)
     contours, _ = cv2.findContours(dilated, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    ticks.append(time.perf_counter())
+    boxes = [cv2.boundingRect(contour) for contour in contours if cv2.contourArea(contour) >= MIN_AREA]
+    ticks.append(time.perf_counter())
 
-    motion_detected = False
+    if timings is not None:
+        for name, start, end in zip(STAGES, ticks, ticks[1:]):
+            timings[name] += end - start
+    return boxes
 
-    for contour in contours:
-        if cv2.contourArea(contour) < 10000:
-            continue
-        motion_detected = True
-        (x, y, w, h) = cv2.boundingRect(contour)
-        cv2.rectangle(frame1, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
-    if motion_detected:
+def show_frame(frame, boxes):
+    # Import di sini supaya mode headless tidak butuh GUI / Windows
+    import pyautogui
+
+    for (x, y, w, h) in boxes:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+    if boxes:
         pyautogui.press('space')
-        cv2.putText(frame1, "SPACE PRESSED!", (20, 50),
+        cv2.putText(frame, "SPACE PRESSED!", (20, 50),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
 
     # Tampilkan video
-    cv2.imshow("Gerakan Tangan = SPACE", frame1)
+    cv2.imshow(TITLE, frame)
     try:
-        win = gw.getWindowsWithTitle("Gerakan Tangan = SPACE")[0]
+        import pygetwindow as gw
+        import win32gui
+        import win32con
+        win = gw.getWindowsWithTitle(TITLE)[0]
         hwnd = win._hWnd
         win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
                               win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
     except:
         pass
 
-    frame1 = frame2
-    ret, frame2 = cap.read()
+    return cv2.waitKey(1) == ord('q')
+
+
+def run_serial(cap):
+    _, frame1 = cap.read()
+    _, frame2 = cap.read()
+
+    while True:
+        quit = show_frame(frame1, detect_motion(frame1, frame2))
+
+        frame1 = frame2
+        ret, frame2 = cap.read()
+
+        if not ret or quit:
+            break
+
+
+class RingBuffer:
+    # Antrian FIFO terbatas: kalau penuh, frame paling lama dibuang supaya tidak menumpuk
+    def __init__(self, size=2, drop=True):
+        # drop=False: put() menunggu ada tempat, tidak ada frame yang hilang (untuk mode headless)
+        self.items = collections.deque(maxlen=size)
+        self.drop = drop
+        self.dropped = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, item):
+        with self.condition:
+            if not self.drop:
+                self.condition.wait_for(lambda: len(self.items) < self.items.maxlen or self.closed)
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self):
+        # Ambil item paling lama yang masih ada di buffer
+        with self.condition:
+            self.condition.wait_for(lambda: self.items or self.closed)
+            if not self.items:
+                return None
+            self.condition.notify_all()
+            return self.items.popleft()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class StageStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.last = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.count += 1
+            self.total += seconds
+            self.worst = max(self.worst, seconds)
+            self.last = seconds
+
+    def summary(self):
+        with self.lock:
+            mean = self.total / self.count if self.count else 0.0
+            return {"count": self.count, "mean_ms": mean * 1000, "max_ms": self.worst * 1000, "last_ms": self.last * 1000}
+
+
+class Pipeline:
+    # Tiga tahap: ambil frame (thread), proses (thread), tampilkan + tekan tombol (thread utama)
+    def __init__(self, cap, buffer_size=2, drop=True):
+        self.cap = cap
+        self.frames = RingBuffer(buffer_size, drop)
+        self.results = RingBuffer(buffer_size, drop)
+        self.stats = {name: StageStats() for name in ("capture", "process", "display", "latency")}
+        self.stop = threading.Event()
+
+    def capture(self):
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            now = time.perf_counter()
+            self.stats["capture"].record(now - start)
+            self.frames.put((now, frame))
+        self.frames.close()
+
+    def process(self):
+        previous = None
+        while not self.stop.is_set():
+            item = self.frames.get()
+            if item is None:
+                break
+            captured, frame = item
+            if previous is not None:
+                start = time.perf_counter()
+                boxes = detect_motion(previous, frame)
+                self.stats["process"].record(time.perf_counter() - start)
+                self.results.put((captured, previous, boxes))
+            previous = frame
+        self.results.close()
+
+    def run(self, show=show_frame):
+        workers = [threading.Thread(target=self.capture, daemon=True),
+                   threading.Thread(target=self.process, daemon=True)]
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                item = self.results.get()
+                if item is None:
+                    break
+                captured, frame, boxes = item
+                start = time.perf_counter()
+                quit = show(frame, boxes)
+                done = time.perf_counter()
+                self.stats["display"].record(done - start)
+                self.stats["latency"].record(done - captured)
+                if quit:
+                    break
+        finally:
+            self.stop.set()
+            self.frames.close()
+            self.results.close()
+            for worker in workers:
+                worker.join(timeout=1)
+        return self.report()
+
+    def report(self):
+        report = {name: stats.summary() for name, stats in self.stats.items()}
+        report["dropped"] = {"frames": self.frames.dropped, "results": self.results.dropped}
+        return report
+
+
+def read_frames(source):
+    # Sumber bisa file video atau folder berisi gambar (diurutkan menurut nama)
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            frame = cv2.imread(os.path.join(source, name))
+            if frame is not None:
+                yield frame
+        return
+    cap = cv2.VideoCapture(source)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+
+def synthetic_frames(count=300, width=640, height=480, seed=0):
+    # Frame buatan: latar dengan noise kamera, ada "tangan" lewat setiap 30 frame
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        frame = background + rng.integers(0, 8, background.shape, dtype=np.uint8)
+        if (i // 30) % 2:
+            x = (i * 211) % (width - 200)
+            frame[height // 4:height // 4 + 200, x:x + 200] = (180, 170, 200)
+        yield frame
+
+
+class FrameSource:
+    # Bungkus generator frame supaya bisa dipakai seperti cv2.VideoCapture
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    def read(self):
+        frame = next(self.frames, None)
+        return frame is not None, frame
+
+    def release(self):
+        pass
+
+
+def run_headless(frames):
+    timings = dict.fromkeys(["read"] + STAGES, 0.0)
+    events = []
+    frames = iter(frames)
+    previous = None
+    total = processed = 0
+    start = time.perf_counter()
+    while True:
+        tick = time.perf_counter()
+        frame = next(frames, None)
+        timings["read"] += time.perf_counter() - tick
+        if frame is None:
+            break
+        if previous is not None:
+            boxes = detect_motion(previous, frame, timings)
+            processed += 1
+            if boxes:
+                events.append({"frame": total, "boxes": [list(box) for box in boxes]})
+        previous = frame
+        total += 1
+    elapsed = time.perf_counter() - start
+    # fps dihitung dari waktu deteksi saja, tanpa waktu baca / buat frame
+    detecting = sum(timings[name] for name in STAGES)
+    return {
+        "frames": total,
+        "processed": processed,
+        "seconds": elapsed,
+        "detect_seconds": detecting,
+        "fps": processed / detecting if detecting else 0.0,
+        "stage_ms": {name: seconds * 1000 / max(processed, 1) for name, seconds in timings.items()},
+        "events": events,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerakan tangan di depan kamera = tekan SPACE.")
+    parser.add_argument("--pipeline", action="store_true", help="ambil, proses dan tampilkan frame di thread terpisah")
+    parser.add_argument("--buffer", type=int, default=2, help="ukuran ring buffer antar tahap")
+    parser.add_argument("--source", help="mode headless: file video atau folder berisi frame")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="mode headless: pakai N frame buatan")
+    parser.add_argument("--output", help="simpan laporan JSON mode headless ke file ini")
+    args = parser.parse_args()
+
+    if args.source is not None and not os.path.exists(args.source):
+        parser.error(f"sumber {args.source!r} tidak ditemukan")
+    if args.source is not None or args.synthetic is not None:
+        frames = read_frames(args.source) if args.source is not None else synthetic_frames(args.synthetic)
+        if args.pipeline:
+            report = Pipeline(FrameSource(frames), args.buffer, drop=False).run(show=lambda frame, boxes: False)
+        else:
+            report = run_headless(frames)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+        return
+
+    # Inisialisasi kamera
+    cap = cv2.VideoCapture(0)
+    try:
+        if args.pipeline:
+            print(json.dumps(Pipeline(cap, args.buffer).run(), indent=2))
+        else:
+            run_serial(cap)
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
 
-    if not ret or cv2.waitKey(1) == ord('q'):
-        break
 
-cap.release()
-cv2.destroyAllWindows()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,825 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import io
+import itertools
+import re
+from abc import ABC, ABCMeta, abstractmethod
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, FrozenSet, Iterator, List, Any, Optional, Sequence, Set, Union
+from weakref import WeakValueDictionary
+
+class EvaluationException(Exception):
+    pass
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+class EvaluationCache:
+    KEYS = ("model", "symbols")
+
+    def __init__(self, maxsize: int = 1 << 16, key: str = "model"):
+        if key not in self.KEYS: raise ValueError(f"unknown cache key {key!r}, expected one of {self.KEYS}")
+        self.maxsize = maxsize
+        self.key = key
+        self.hits = self.misses = self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._depth = 0
+        self._model_key: Optional[frozenset] = None
+
+    def _key(self, sentence: Sentence, model: Dict[str, bool]) -> tuple:
+        if self.key == "symbols":
+            return (id(sentence), tuple([model[s] for s in sentence._ordered_symbols()]))
+        if self._model_key is None: self._model_key = frozenset(model.items())
+        return (id(sentence), self._model_key)
+
+    def evaluate(self, sentence: Sentence, model: Dict[str, bool]) -> bool:
+        self._depth += 1
+        try:
+            try:
+                key = self._key(sentence, model)
+            except KeyError:
+                return sentence._evaluate(model, self)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+            value = sentence._evaluate(model, self)
+            self._entries[key] = (sentence, value)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+        finally:
+            self._depth -= 1
+            if not self._depth: self._model_key = None
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+shared_cache = EvaluationCache(key="symbols")
+
+_BARE_NAME = re.compile(r'[^\s¬∧∨(),"<=]|[^\s¬∧∨(),"<=](?:[^¬∧∨(),"<=]|<(?!=>)|=(?!>))*[^\s¬∧∨(),"<=]')
+
+_INLINE_DEPTH = 32
+
+_interned: "WeakValueDictionary[tuple, Sentence]" = WeakValueDictionary()
+
+class SentenceMeta(ABCMeta):
+    def __call__(cls, *args, **kwargs):
+        if kwargs: args = inspect.signature(cls.__init__).bind(None, *args, **kwargs).args[1:]
+        args = cls._normalize(*args)
+        key = cls._intern_key(*args)
+        node = _interned.get(key)
+        if node is None:
+            node = super().__call__(*args)
+            _interned[key] = node
+        return node
+
+class Sentence(ABC, metaclass=SentenceMeta):
+    __slots__ = ("__weakref__", "_formula", "_symbols", "_symbol_order")
+
+    def __init__(self):
+        self._formula: Optional[str] = None
+        self._symbols: Optional[FrozenSet[str]] = None
+        self._symbol_order: Optional[tuple] = None
+
+    def evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool, None] = None)->bool:
+        if cache is None: cache = shared_cache
+        if cache is False: return self._evaluate(model, False)
+        return cache.evaluate(self, model)
+    
+    @abstractmethod
+    def _evaluate(self, model: Dict[str,bool], cache: Union[EvaluationCache, bool])->bool: raise NotImplementedError
+    @abstractmethod
+    def _layout(self) -> List[Any]: raise NotImplementedError
+    @abstractmethod
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str: raise NotImplementedError
+    @abstractmethod
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any: raise NotImplementedError
+    @abstractmethod
+    def _args(self) -> tuple: raise NotImplementedError
+    @abstractmethod
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]: raise NotImplementedError
+
+    _precedence = 100
+
+    def precedence(self) -> int:
+        node = self
+        while isinstance(node, (And, Or)) and len(node._args()) == 1: node = node._args()[0]
+        return node._precedence
+
+    def formula(self) -> str:
+        if self._formula is None:
+            out = io.StringIO()
+            stack: List[Any] = [(self, False)]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, str):
+                    out.write(item)
+                    continue
+                node, wrap = item
+                if wrap:
+                    out.write("(")
+                    stack.append(")")
+                if node._formula is not None: out.write(node._formula)
+                else: stack.extend(reversed(node._layout()))
+            self._formula = out.getvalue()
+        return self._formula
+
+    def symbols(self)->FrozenSet[str]:
+        if self._symbols is None:
+            found: Set[str] = set()
+            seen = {id(self)}
+            stack: List[Sentence] = [self]
+            while stack:
+                node = stack.pop()
+                if node._symbols is not None: found |= node._symbols
+                elif isinstance(node, Symbol): found.add(node.name)
+                else:
+                    for child in node._args():
+                        if isinstance(child, Sentence) and id(child) not in seen:
+                            seen.add(id(child))
+                            stack.append(child)
+            self._symbols = frozenset(found)
+        return self._symbols
+
+    def evaluate_partial(self, model: Dict[str, bool]) -> Optional[bool]:
+        return _evaluate_partial(_topological([self]), model)
+
+    def _ordered_symbols(self) -> tuple:
+        if self._symbol_order is None: self._symbol_order = tuple(sorted(self.symbols()))
+        return self._symbol_order
+
+    def compile(self, symbols: Sequence[Any]) -> Callable[[Sequence[bool]], bool]:
+        index = {(s.name if isinstance(s, Symbol) else s): i for i, s in enumerate(symbols)}
+        order = _topological([self])
+        uses: Dict[int, int] = {}
+        for node in order:
+            if not isinstance(node, Symbol):
+                for c in node._args():
+                    if isinstance(c, Sentence): uses[id(c)] = uses.get(id(c), 0) + 1
+        # one local per shared or deep node keeps the code flat; the rest is inlined to keep short-circuiting
+        lines: List[str] = []
+        exprs: Dict[int, str] = {}
+        depth: Dict[int, int] = {}
+        source = lambda c: exprs[id(c)]
+        for node in order:
+            expr = node._source(index, source)
+            level = 1 + max((depth[id(c)] for c in node._args() if isinstance(c, Sentence)), default=0)
+            if node is not self and not isinstance(node, Symbol) and (uses[id(node)] > 1 or level >= _INLINE_DEPTH):
+                lines.append(f"    n{len(lines)} = {expr}")
+                expr, level = f"n{len(lines) - 1}", 0
+            exprs[id(node)], depth[id(node)] = expr, level
+        lines.append(f"    return {exprs[id(self)]}")
+        namespace: Dict[str, Any] = {"__builtins__": {}}
+        exec("def evaluate(v):\n" + "\n".join(lines), namespace)
+        return namespace["evaluate"]
+
+    @classmethod
+    def _normalize(cls, *args) -> tuple:
+        for arg in args: Sentence.validate(arg)
+        return args
+
+    @classmethod
+    def _intern_key(cls, *args) -> tuple: return (cls, *args)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    def __reduce__(self): return (type(self), self._args())
+    def __copy__(self) -> Sentence: return self
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Sentence: return self
+    
+    def __and__(self, other:Sentence)-> And: return And(self, other)
+    def __or__(self, other:Sentence) -> Or: return Or(self, other)
+    def __invert__(self)->Not: return Not(self)
+    
+    @classmethod
+    def validate(cls, sentence:Any):
+        if not isinstance(sentence, Sentence): raise TypeError("must be a logical sentence!")
+            
+    @classmethod
+    def parenthesize(cls, s:str)->str:
+        if not len(s) or s.isalpha(): return s
+        if s[0] == "(" and s[-1] == ")":
+            depth = 0
+            for i, c in enumerate(s):
+                if c == "(": depth += 1
+                elif c == ")":
+                    depth -= 1
+                    if depth == 0: break
+            if i == len(s) - 1 and depth == 0: return s
+        return f"({s})"
+
+class Symbol(Sentence):
+    __slots__ = ("name",)
+
+    def __init__(self, name:str):
+        super().__init__()
+        self.name = name
+
+    @classmethod
+    def _normalize(cls, name: str) -> tuple: return (name,)
+    @classmethod
+    def _intern_key(cls, name: str) -> tuple: return (cls, name)
+
+    def __str__(self) -> str: return self.name
+    def __repr__(self)->str: return self.name
+    def _args(self) -> tuple: return (self.name,)
+    
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool])->bool:
+        try:
+            return model[self.name]
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model") 
+
+    def _layout(self) -> List[Any]:
+        if _BARE_NAME.fullmatch(self.name) and self.name not in ("True", "False"): return [self.name]
+        return ['"' + self.name.replace("\\", "\\\\").replace('"', '\\"') + '"']
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]: return model.get(self.name)
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        try:
+            return f"v[{index[self.name]}]"
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        try:
+            return columns[self.name]
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+    
+class Not(Sentence):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: Sentence):
+        super().__init__()
+        self.operand = operand
+
+    def _args(self) -> tuple: return (self.operand,)
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool: return not self.operand.evaluate(model, cache)
+    _precedence = 50
+
+    def _layout(self) -> List[Any]: return ["¬", (self.operand, self.operand.precedence() < 50)]
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str: return f"(not {source(self.operand)})"
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any: return ~self.operand._bits(columns, ones)
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        operand = value(self.operand)
+        return None if operand is None else not operand
+
+def _join(separator: str, items: List[Any]) -> List[Any]:
+    joined: List[Any] = []
+    for item in items:
+        if joined: joined.append(separator)
+        joined.append(item)
+    return joined
+
+def _flatten(cls: type, children: Sequence[Sentence], attribute: str) -> tuple:
+    flat: Dict[int, Sentence] = {}
+    for child in children:
+        Sentence.validate(child)
+        for c in (getattr(child, attribute) if isinstance(child, cls) else (child,)):
+            flat.setdefault(id(c), c)
+    return tuple(flat.values())
+    
+class And(Sentence):
+    __slots__ = ("conjuncts",)
+
+    def __init__(self, *conjuncts: Sentence):
+        super().__init__()
+        self.conjuncts: tuple = conjuncts
+
+    @classmethod
+    def _normalize(cls, *conjuncts: Sentence) -> tuple: return _flatten(And, conjuncts, "conjuncts")
+    @classmethod
+    def _intern_key(cls, *conjuncts: Sentence) -> tuple: return (cls, *sorted(conjuncts, key=id))
+
+    def _args(self) -> tuple: return self.conjuncts
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool: return all(c.evaluate(model, cache) for c in self.conjuncts)
+    
+    _precedence = 40
+
+    def _layout(self) -> List[Any]:
+        if not self.conjuncts: return ["True"]
+        if len(self.conjuncts) == 1: return [(self.conjuncts[0], False)]
+        return _join(" ∧ ", [(c, c.precedence() < 40) for c in self.conjuncts])
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        if not self.conjuncts: return "True"
+        return "(" + " and ".join(source(c) for c in self.conjuncts) + ")"
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        out = ones.copy()
+        for c in self.conjuncts: out &= c._bits(columns, ones)
+        return out
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        result: Optional[bool] = True
+        for c in self.conjuncts:
+            v = value(c)
+            if v is False: return False
+            if v is None: result = None
+        return result
+    
+class Or(Sentence):
+    __slots__ = ("disjuncts",)
+
+    def __init__(self, *disjuncts: Sentence):
+        super().__init__()
+        self.disjuncts: tuple = disjuncts
+
+    @classmethod
+    def _normalize(cls, *disjuncts: Sentence) -> tuple: return _flatten(Or, disjuncts, "disjuncts")
+    @classmethod
+    def _intern_key(cls, *disjuncts: Sentence) -> tuple: return (cls, *sorted(disjuncts, key=id))
+
+    def _args(self) -> tuple: return self.disjuncts
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool: return any(d.evaluate(model, cache) for d in self.disjuncts)
+    
+    _precedence = 30
+
+    def _layout(self) -> List[Any]:
+        if not self.disjuncts: return ["False"]
+        if len(self.disjuncts) == 1: return [(self.disjuncts[0], False)]
+        return _join(" ∨ ", [(d, d.precedence() < 30) for d in self.disjuncts])
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        if not self.disjuncts: return "False"
+        return "(" + " or ".join(source(d) for d in self.disjuncts) + ")"
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        out = ones ^ ones
+        for d in self.disjuncts: out |= d._bits(columns, ones)
+        return out
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        result: Optional[bool] = False
+        for d in self.disjuncts:
+            v = value(d)
+            if v is True: return True
+            if v is None: result = None
+        return result
+
+class Implication(Sentence):
+    __slots__ = ("antecedent", "consequent")
+
+    def __init__(self, antecedent: Sentence, consequent: Sentence):
+        super().__init__()
+        self.antecedent = antecedent
+        self.consequent = consequent
+
+    def _args(self) -> tuple: return (self.antecedent, self.consequent)
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool: return (not self.antecedent.evaluate(model, cache)) or self.consequent.evaluate(model, cache)
+    
+    _precedence = 20
+
+    def _layout(self) -> List[Any]:
+        return [(self.antecedent, self.antecedent.precedence() <= 20), " => ", (self.consequent, self.consequent.precedence() < 20)]
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        return f"(not {source(self.antecedent)} or {source(self.consequent)})"
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        return ~self.antecedent._bits(columns, ones) | self.consequent._bits(columns, ones)
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        ante = value(self.antecedent)
+        if ante is False: return True
+        cons = value(self.consequent)
+        if cons is True: return True
+        return False if ante is True and cons is False else None
+
+class Biconditional(Sentence):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Sentence, right: Sentence):
+        super().__init__()
+        self.left = left
+        self.right = right
+
+    def _args(self) -> tuple: return (self.left, self.right)
+    def _evaluate(self, model:Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool: return self.left.evaluate(model, cache) == self.right.evaluate(model, cache)
+    
+    _precedence = 10
+
+    def _layout(self) -> List[Any]:
+        return [(self.left, self.left.precedence() <= 10), " <=> ", (self.right, self.right.precedence() < 10)]
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        return f"({source(self.left)} == {source(self.right)})"
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        return ~(self.left._bits(columns, ones) ^ self.right._bits(columns, ones))
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        left = value(self.left)
+        if left is None: return None
+        right = value(self.right)
+        return None if right is None else left == right
+
+
+class Cardinality(Sentence):
+    __slots__ = ("k", "operands")
+
+    def __init__(self, k: int, *operands: Sentence):
+        super().__init__()
+        self.k = k
+        self.operands: tuple = operands
+
+    @abstractmethod
+    def bounds(self) -> tuple: raise NotImplementedError
+
+    @classmethod
+    def _normalize(cls, k: int, *operands: Sentence) -> tuple:
+        if not isinstance(k, int) or k < 0: raise ValueError("k must be a non-negative integer")
+        for operand in operands: Sentence.validate(operand)
+        return (k, *operands)
+
+    @classmethod
+    def _intern_key(cls, k: int, *operands: Sentence) -> tuple: return (cls, k, *operands)
+
+    def _args(self) -> tuple: return (self.k, *self.operands)
+
+    def _evaluate(self, model: Dict[str, bool], cache: Union[EvaluationCache, bool]) -> bool:
+        low, high = self.bounds()
+        count = 0
+        for operand in self.operands:
+            if operand.evaluate(model, cache):
+                count += 1
+                if high is not None and count > high: return False
+        return count >= low
+
+    def _layout(self) -> List[Any]:
+        return [f"{type(self).__name__}(", *_join(", ", [str(self.k)] + [(o, False) for o in self.operands]), ")"]
+
+    def _source(self, index: Dict[str, int], source: Callable[[Sentence], str]) -> str:
+        low, high = self.bounds()
+        total = " + ".join(source(o) for o in self.operands) or "0"
+        if high is None: return f"({total} >= {low})"
+        return f"({low} <= {total} <= {high})"
+
+    def _bits(self, columns: Dict[str, Any], ones: Any) -> Any:
+        low, high = self.bounds()
+        levels = [ones ^ ones for _ in range(low if high is None else high + 1)]
+        for operand in self.operands:
+            x = operand._bits(columns, ones)
+            for j in range(len(levels) - 1, 0, -1): levels[j] |= levels[j - 1] & x
+            if levels: levels[0] |= x
+        out = levels[low - 1].copy() if low else ones.copy()
+        if high is not None: out &= ~levels[high]
+        return out
+
+    def _partial(self, model: Dict[str, bool], value: Callable[[Sentence], Optional[bool]]) -> Optional[bool]:
+        low, high = self.bounds()
+        true = unknown = 0
+        for operand in self.operands:
+            v = value(operand)
+            if v is True: true += 1
+            elif v is None: unknown += 1
+        if (high is not None and true > high) or true + unknown < low: return False
+        if true >= low and (high is None or true + unknown <= high): return True
+        return None
+
+    def expand(self) -> Sentence:
+        low, high = self.bounds()
+        n = len(self.operands)
+        if low > n: return Or()
+        clauses = [Or(*subset) for subset in itertools.combinations(self.operands, n - low + 1)] if low else []
+        if high is not None and high < n:
+            clauses += [Or(*[Not(o) for o in subset]) for subset in itertools.combinations(self.operands, high + 1)]
+        return And(*clauses)
+
+class AtMostK(Cardinality):
+    __slots__ = ()
+    def bounds(self) -> tuple: return (0, self.k)
+
+class AtLeastK(Cardinality):
+    __slots__ = ()
+    def bounds(self) -> tuple: return (self.k, None)
+
+class ExactlyOne(Cardinality):
+    __slots__ = ()
+    def __init__(self, *operands: Sentence):
+        super().__init__(1, *operands)
+
+    @classmethod
+    def _normalize(cls, *operands: Sentence) -> tuple:
+        for operand in operands: Sentence.validate(operand)
+        return operands
+
+    @classmethod
+    def _intern_key(cls, *operands: Sentence) -> tuple: return (cls, *operands)
+
+    def _args(self) -> tuple: return self.operands
+    def bounds(self) -> tuple: return (1, 1)
+    def _layout(self) -> List[Any]: return ["ExactlyOne(", *_join(", ", [(o, False) for o in self.operands]), ")"]
+
+
+TRUE = And()
+FALSE = Or()
+
+def _literal(sentence: Sentence) -> Optional[tuple]:
+    if isinstance(sentence, Symbol): return (sentence.name, True)
+    if isinstance(sentence, Not) and isinstance(sentence.operand, Symbol): return (sentence.operand.name, False)
+    return None
+
+def _negate(sentence: Sentence) -> Sentence:
+    if sentence is TRUE: return FALSE
+    if sentence is FALSE: return TRUE
+    return sentence.operand if isinstance(sentence, Not) else Not(sentence)
+
+def _subsumption(items: List[Sentence], inner: type) -> List[Sentence]:
+    attribute = "disjuncts" if inner is Or else "conjuncts"
+    sets = [frozenset(map(id, getattr(s, attribute))) if isinstance(s, inner) else frozenset((id(s),)) for s in items]
+    occurs: Dict[int, List[int]] = {}
+    for i, members in enumerate(sets):
+        for member in members: occurs.setdefault(member, []).append(i)
+    removed: Set[int] = set()
+    for i in sorted(range(len(sets)), key=lambda i: len(sets[i])):
+        if i in removed: continue
+        smallest = min(sets[i], key=lambda member: len(occurs[member]))
+        for j in occurs[smallest]:
+            if j != i and j not in removed and len(sets[j]) >= len(sets[i]) and sets[i] <= sets[j]: removed.add(j)
+    return [s for i, s in enumerate(items) if i not in removed]
+
+def _propagate_units(children: List[Sentence], values: Dict[str, bool]) -> Optional[List[Sentence]]:
+    values = dict(values)
+    items: List[Optional[Sentence]] = []
+    occurs: Dict[str, List[int]] = {}
+    queue: List[tuple] = []
+
+    def add(child: Sentence):
+        for c in (child.conjuncts if isinstance(child, And) else (child,)):
+            lit = _literal(c)
+            if lit is not None: queue.append(lit)
+            else:
+                for name in c.symbols(): occurs.setdefault(name, []).append(len(items))
+            items.append(c)
+
+    for child in children: add(child)
+    while queue:
+        dirty: Set[int] = set()
+        while queue:
+            name, value = queue.pop()
+            if name in values:
+                if values[name] != value: return None
+                continue
+            values[name] = value
+            dirty.update(occurs.pop(name, ()))
+        memo: Dict[int, tuple] = {}
+        for i in sorted(dirty):
+            child, items[i] = items[i], None
+            if child is None: continue
+            result = _simplify(child, values, memo)
+            if result is FALSE: return None
+            add(result)
+    return [c for c in items if c is not None]
+
+def _simplify_junction(node: Sentence, children: List[Sentence], values: Dict[str, bool]) -> Sentence:
+    conjunction = isinstance(node, And)
+    unit, zero = (TRUE, FALSE) if conjunction else (FALSE, TRUE)
+    attribute = "conjuncts" if conjunction else "disjuncts"
+    if any(c is zero for c in children): return zero
+    children = [c for c in _flatten(type(node), children, attribute) if c is not unit]
+    if conjunction:
+        children = _propagate_units(children, values)
+        if children is None: return zero
+        children = list(_flatten(And, children, attribute))
+    present = set(map(id, children))
+    if any(isinstance(c, Not) and id(c.operand) in present for c in children): return zero
+    children = _subsumption(children, Or if conjunction else And)
+    return children[0] if len(children) == 1 else type(node)(*children)
+
+def _simplify_node(node: Sentence, values: Dict[str, bool], memo: Dict[int, tuple]) -> Sentence:
+    done = lambda child: memo[id(child)][1]
+    if isinstance(node, Symbol):
+        return node if node.name not in values else TRUE if values[node.name] else FALSE
+    if isinstance(node, Not):
+        return _negate(done(node.operand))
+    if isinstance(node, (And, Or)):
+        return _simplify_junction(node, [done(c) for c in node._args()], values)
+    if isinstance(node, Implication):
+        a, b = done(node.antecedent), done(node.consequent)
+        if a is TRUE: return b
+        if a is FALSE or b is TRUE or a is b: return TRUE
+        if b is FALSE: return _negate(a)
+        return Implication(a, b)
+    if isinstance(node, Biconditional):
+        a, b = done(node.left), done(node.right)
+        if a is b: return TRUE
+        if a is TRUE or b is TRUE: return b if a is TRUE else a
+        if a is FALSE or b is FALSE: return _negate(b if a is FALSE else a)
+        if a is _negate(b): return FALSE
+        return Biconditional(a, b)
+    if isinstance(node, Cardinality):
+        low, high = node.bounds()
+        operands = [done(o) for o in node.operands]
+        true = sum(1 for o in operands if o is TRUE)
+        operands = [o for o in operands if o is not TRUE and o is not FALSE]
+        low, high = low - true, None if high is None else high - true
+        n = len(operands)
+        if (high is not None and high < 0) or low > n: return FALSE
+        if low <= 0 and (high is None or high >= n): return TRUE
+        if high == 0: return simplify(And(*map(_negate, operands)))
+        if low == n: return simplify(And(*operands))
+        if low == 1 and high is None: return simplify(Or(*operands))
+        if low == 1 and high == 1: return ExactlyOne(*operands)
+        if low <= 0: return AtMostK(high, *operands)
+        if high is None or high >= n: return AtLeastK(low, *operands)
+        return And(AtLeastK(low, *operands), AtMostK(high, *operands))
+    raise TypeError(f"cannot simplify {type(node).__name__}")
+
+def _simplify(root: Sentence, values: Dict[str, bool], memo: Dict[int, tuple]) -> Sentence:
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in memo: continue
+        if expanded or isinstance(node, Symbol):
+            memo[id(node)] = (node, _simplify_node(node, values, memo))
+            continue
+        stack.append((node, True))
+        stack.extend((c, False) for c in node._args() if isinstance(c, Sentence) and id(c) not in memo)
+    return memo[id(root)][1]
+
+def simplify(sentence: Sentence) -> Sentence:
+    return _simplify(sentence, {}, {})
+
+def _topological(roots: Sequence[Sentence]) -> List[Sentence]:
+    order: List[Sentence] = []
+    seen: Set[int] = set()
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in seen: continue
+        if expanded:
+            seen.add(id(node))
+            order.append(node)
+            continue
+        stack.append((node, True))
+        if not isinstance(node, Symbol):
+            stack.extend((c, False) for c in reversed(node._args()) if isinstance(c, Sentence) and id(c) not in seen)
+    return order
+
+def _evaluate_partial(order: List[Sentence], model: Dict[str, bool]) -> Optional[bool]:
+    # Kleene evaluation of order[-1] over a post-order from _topological; children are read from the value map
+    values: Dict[int, Optional[bool]] = {}
+    value = lambda c: values[id(c)]
+    for node in order: values[id(node)] = node._partial(model, value)
+    return values[id(order[-1])]
+
+def _satisfying_prefixes(sentence: Sentence, names: List[str]) -> Iterator[tuple]:
+    # yields (i, mask) for each assignment to names[:i] (bit j set when names[j] is true) that already makes sentence true
+    order = _topological([sentence])
+    model: Dict[str, bool] = {}
+    # (i, mask, value): assign value to names[i - 1], undoing any deeper assignments first
+    stack: List[tuple] = [(0, 0, None)]
+    while stack:
+        i, mask, value = stack.pop()
+        if i:
+            while len(model) >= i: del model[names[len(model) - 1]]
+            model[names[i - 1]] = value
+        result = _evaluate_partial(order, model)
+        if result is True: yield i, mask
+        elif result is None: stack.extend(((i + 1, mask, False), (i + 1, mask | (1 << i), True)))
+
+def _assignments(n: int) -> Iterator[tuple]:
+    return itertools.product([True, False], repeat=n)
+
+def _enumerate_model_check(knowledge, query, all_symbols):
+    try:
+        evaluate_kb, evaluate_query = knowledge.compile(all_symbols), query.compile(all_symbols)
+    except EvaluationException:
+        return _evaluate_model_check(knowledge, query, all_symbols)
+    for p in _assignments(len(all_symbols)):
+        if evaluate_kb(p) and not evaluate_query(p):
+            return False
+    return True
+
+def _backtrack_model_check(knowledge, query, all_symbols):
+    names = [symbol.name for symbol in all_symbols]
+    if not (knowledge.symbols() <= set(names) and query.symbols() <= set(names)):
+        return _evaluate_model_check(knowledge, query, all_symbols)
+    return next(_satisfying_prefixes(And(knowledge, Not(query)), names), None) is None
+
+def _evaluate_model_check(knowledge, query, all_symbols):
+    def evaluate_kb(model):
+        try:
+            return knowledge.evaluate(model)
+        except EvaluationException:
+            return False
+            
+    for p in _assignments(len(all_symbols)):
+        model = {symbol.name : value for symbol,value in zip(all_symbols, p)}
+    
+        if evaluate_kb(model) and not query.evaluate(model):
+            return False
+    return True
+
+def _lazy(module: str, name: str) -> Callable:
+    def call(*args, **kwargs): return getattr(importlib.import_module(module, __name__), name)(*args, **kwargs)
+    call.__name__ = call.__qualname__ = name
+    return call
+
+BACKENDS: Dict[str, Callable] = {
+    "enumerate": _enumerate_model_check,
+    "sat": _lazy(".sat", "_sat_model_check"),
+    "numpy": _lazy(".vectorized", "_numpy_model_check"),
+    "parallel": _lazy(".parallel", "_parallel_model_check"),
+    "backtrack": _backtrack_model_check,
+    "bdd": _lazy(".bdd", "_bdd_model_check"),
+}
+DEFAULT_BACKEND = "sat"
+
+def model_check(knowledge, query, all_symbols, backend: Optional[str] = None):
+    try:
+        check = BACKENDS[backend or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    if knowledge.symbols() <= {symbol.name for symbol in all_symbols}: knowledge = simplify(knowledge)
+    return check(knowledge, query, all_symbols)
+
+YES, NO, MAYBE = "YES", "NO", "MAYBE"
+
+def _verdict(can_be_true: bool, can_be_false: bool) -> str:
+    if not can_be_false: return YES
+    if not can_be_true: return NO
+    return MAYBE
+
+def _model_check_many(knowledge, queries, all_symbols, backend):
+    return [YES if model_check(knowledge, q, all_symbols, backend)
+            else NO if model_check(knowledge, Not(q), all_symbols, backend)
+            else MAYBE for q in queries]
+
+def _enumerate_entails_many(knowledge, queries, all_symbols):
+    try:
+        evaluate_kb = knowledge.compile(all_symbols)
+        evaluate_queries = [q.compile(all_symbols) for q in queries]
+    except EvaluationException:
+        return _model_check_many(knowledge, queries, all_symbols, "enumerate")
+    can_be_true = [False] * len(queries)
+    can_be_false = [False] * len(queries)
+    open_queries = list(range(len(queries)))
+    for p in _assignments(len(all_symbols)):
+        if not evaluate_kb(p): continue
+        for i in open_queries:
+            if evaluate_queries[i](p): can_be_true[i] = True
+            else: can_be_false[i] = True
+        open_queries = [i for i in open_queries if not (can_be_true[i] and can_be_false[i])]
+        if not open_queries: break
+    return [_verdict(t, f) for t, f in zip(can_be_true, can_be_false)]
+
+BATCH_BACKENDS: Dict[str, Callable] = {
+    "enumerate": _enumerate_entails_many,
+    "sat": _lazy(".sat", "_sat_entails_many"),
+    "numpy": _lazy(".vectorized", "_numpy_entails_many"),
+    "bdd": _lazy(".bdd", "_bdd_entails_many"),
+}
+
+def entails_many(knowledge, queries, all_symbols=None, backend: Optional[str] = None) -> Dict[Sentence, str]:
+    queries = list(queries)
+    if all_symbols is None:
+        all_symbols = [Symbol(name) for name in sorted(knowledge.symbols().union(*[q.symbols() for q in queries]))]
+    backend = backend or DEFAULT_BACKEND
+    if knowledge.symbols() <= {symbol.name for symbol in all_symbols}: knowledge = simplify(knowledge)
+    if backend in BATCH_BACKENDS: verdicts = BATCH_BACKENDS[backend](knowledge, queries, all_symbols)
+    else: verdicts = _model_check_many(knowledge, queries, all_symbols, backend)
+    return dict(zip(queries, verdicts))
+
+def exactly_one(symbols):
+    return ExactlyOne(*symbols)
+
+_SUBMODULES = {
+    "sat": ["SATSolver", "CNF", "CNFEncoder", "to_cnf", "KnowledgeBase"],
+    "counting": ["count_models", "iter_models", "decode_model"],
+    "vectorized": ["MEMORY_BUDGET", "truth_table_bits"],
+    "bdd": ["BDD", "CompiledKB", "bdd_order", "compile_bdd", "marginals"],
+    "parser": ["ParseError", "parse", "load_rules"],
+    "kbfile": ["KB_MAGIC", "KB_VERSION", "KBFile", "FormulaArena", "save_kb", "load_kb"],
+    "profiling": ["ProfileStats", "profile"],
+}
+_LAZY_NAMES = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = [
+    "EvaluationException", "CacheInfo", "EvaluationCache", "shared_cache", "SentenceMeta", "Sentence", "Symbol", "Not",
+    "And", "Or", "Implication", "Biconditional", "Cardinality", "AtMostK", "AtLeastK", "ExactlyOne", "TRUE", "FALSE",
+    "simplify", "BACKENDS", "DEFAULT_BACKEND", "model_check", "YES", "NO", "MAYBE", "BATCH_BACKENDS", "entails_many",
+    "exactly_one", *_LAZY_NAMES,
+]
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES: return importlib.import_module(f".{name}", __name__)
+    if name not in _LAZY_NAMES: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
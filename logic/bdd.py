@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from . import (YES, And, Biconditional, Cardinality, Implication, Not, Or, Sentence, Symbol,
+               _enumerate_entails_many, _enumerate_model_check, _topological, _verdict)
+from .counting import _model_symbols
+
+_TERMINAL = 0x7fffffff
+
+class BDD:
+    """Reduced ordered BDD manager. Nodes are indices into parallel arrays; 0 is false and 1 is true."""
+
+    def __init__(self, order: Sequence[str] = ()):
+        self.order: List[str] = []
+        self.level: Dict[str, int] = {}
+        self.var = array("i", [_TERMINAL, _TERMINAL])
+        self.low = array("i", [0, 1])
+        self.high = array("i", [0, 1])
+        self._unique: Dict[tuple, int] = {}
+        self._computed: Dict[tuple, int] = {}
+        for name in order: self.variable(name)
+
+    def __len__(self) -> int: return len(self.var)
+
+    def variable(self, name: str) -> int:
+        if name not in self.level:
+            self.level[name] = len(self.order)
+            self.order.append(name)
+        return self.node(self.level[name], 0, 1)
+
+    def node(self, level: int, low: int, high: int) -> int:
+        if low == high: return low
+        key = (level, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = self._unique[key] = len(self.var)
+            self.var.append(level)
+            self.low.append(low)
+            self.high.append(high)
+        return u
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        var, low, high, computed = self.var, self.low, self.high, self._computed
+        results: List[int] = []
+        stack = [(f, g, h, -1)]
+        while stack:
+            f, g, h, top = stack.pop()
+            if top >= 0:
+                hi, lo = results.pop(), results.pop()
+                results.append(computed.setdefault((f, g, h), self.node(top, lo, hi)))
+                continue
+            if f < 2: results.append(g if f else h); continue
+            if g == h: results.append(g); continue
+            if g == 1 and h == 0: results.append(f); continue
+            u = computed.get((f, g, h))
+            if u is not None: results.append(u); continue
+            top = min(var[f], var[g], var[h])
+            f0, f1 = (low[f], high[f]) if var[f] == top else (f, f)
+            g0, g1 = (low[g], high[g]) if var[g] == top else (g, g)
+            h0, h1 = (low[h], high[h]) if var[h] == top else (h, h)
+            stack.append((f, g, h, top))
+            stack.append((f1, g1, h1, -1))
+            stack.append((f0, g0, h0, -1))
+        return results[0]
+
+    def negate(self, f: int) -> int: return self.ite(f, 0, 1)
+    def conjoin(self, f: int, g: int) -> int: return self.ite(f, g, 0)
+    def disjoin(self, f: int, g: int) -> int: return self.ite(f, 1, g)
+
+    def _threshold(self, operands: List[int], low: int, high: Optional[int]) -> int:
+        cap = low if high is None else high + 1
+        row = [int(c >= low and (high is None or c <= high)) for c in range(cap + 1)]
+        for f in reversed(operands):
+            row = [self.ite(f, row[min(c + 1, cap)], row[c]) for c in range(cap + 1)]
+        return row[0]
+
+    def _balanced(self, op: Callable[[int, int], int], items: List[int], unit: int) -> int:
+        while len(items) > 1:
+            items = [op(items[i], items[i + 1]) if i + 1 < len(items) else items[i] for i in range(0, len(items), 2)]
+        return items[0] if items else unit
+
+    def build(self, sentence: Sentence) -> int:
+        built: Dict[int, int] = {}
+        for node in _topological([sentence]):
+            if isinstance(node, Symbol):
+                u = self.variable(node.name)
+            elif isinstance(node, Not):
+                u = self.negate(built[id(node.operand)])
+            elif isinstance(node, And):
+                u = self._balanced(self.conjoin, [built[id(c)] for c in node.conjuncts], 1)
+            elif isinstance(node, Or):
+                u = self._balanced(self.disjoin, [built[id(c)] for c in node.disjuncts], 0)
+            elif isinstance(node, Implication):
+                u = self.ite(built[id(node.antecedent)], built[id(node.consequent)], 1)
+            elif isinstance(node, Biconditional):
+                right = built[id(node.right)]
+                u = self.ite(built[id(node.left)], right, self.negate(right))
+            else:
+                u = self._threshold([built[id(o)] for o in node.operands], *node.bounds())
+            built[id(node)] = u
+        return built[id(sentence)]
+
+    def _reachable(self, f: int) -> List[int]:
+        seen, stack = {f}, [f]
+        while stack:
+            u = stack.pop()
+            if u < 2: continue
+            for child in (self.low[u], self.high[u]):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return sorted(seen)
+
+    def restrict(self, f: int, assignment: Dict[str, bool]) -> int:
+        fixed = {self.level[name]: value for name, value in assignment.items() if name in self.level}
+        out = {0: 0, 1: 1}
+        for u in self._reachable(f):
+            if u < 2: continue
+            level = self.var[u]
+            if level in fixed: out[u] = out[self.high[u] if fixed[level] else self.low[u]]
+            else: out[u] = self.node(level, out[self.low[u]], out[self.high[u]])
+        return out[f]
+
+    def count(self, f: int) -> int:
+        n = len(self.order)
+        depth = lambda u: n if u < 2 else self.var[u]
+        counts = {0: 0, 1: 1}
+        for u in self._reachable(f):
+            if u < 2: continue
+            lo, hi, d = self.low[u], self.high[u], self.var[u]
+            counts[u] = (counts[lo] << (depth(lo) - d - 1)) + (counts[hi] << (depth(hi) - d - 1))
+        return counts[f] << depth(f)
+
+    def weighted_marginals(self, f: int, priors: Sequence[float]) -> tuple:
+        n = len(self.order)
+        depth = lambda u: n if u < 2 else self.var[u]
+        nodes = [u for u in self._reachable(f) if u > 1]
+        up = {0: 0.0, 1: 1.0}
+        for u in nodes:
+            p = priors[self.var[u]]
+            up[u] = (1 - p) * up[self.low[u]] + p * up[self.high[u]]
+        down = dict.fromkeys(nodes, 0.0)
+        down[f] = 1.0
+        true_mass = [0.0] * n
+        skipped = [0.0] * (n + 1)
+        skipped[0] += up[f]
+        skipped[depth(f)] -= up[f]
+        for u in reversed(nodes):
+            d, p = self.var[u], priors[self.var[u]]
+            for child, weight in ((self.low[u], 1 - p), (self.high[u], p)):
+                mass = down[u] * weight * up[child]
+                if child > 1: down[child] += down[u] * weight
+                skipped[d + 1] += mass
+                skipped[depth(child)] -= mass
+            true_mass[d] += down[u] * p * up[self.high[u]]
+        running = 0.0
+        for level in range(n):
+            running += skipped[level]
+            true_mass[level] += priors[level] * running
+        return up[f], true_mass
+
+    def clear_cache(self): self._computed.clear()
+
+def bdd_order(knowledge: Sentence) -> List[str]:
+    order: Dict[str, None] = {}
+    for node in _topological([knowledge]):
+        if isinstance(node, Cardinality):
+            for operand in node.operands: order.update(dict.fromkeys(sorted(operand.symbols())))
+    for node in _topological([knowledge]):
+        if isinstance(node, Symbol): order.setdefault(node.name)
+    return list(order)
+
+def _prior_names(priors) -> Dict[str, float]:
+    return {(s.name if isinstance(s, Symbol) else s): p for s, p in (priors or {}).items()}
+
+class CompiledKB:
+    def __init__(self, bdd: BDD, root: int, knowledge: Sentence):
+        self.bdd = bdd
+        self.root = root
+        self.knowledge = knowledge
+
+    def __len__(self) -> int: return len(self.bdd._reachable(self.root))
+
+    def satisfiable(self) -> bool: return self.root != 0
+
+    def entails(self, query: Sentence) -> bool:
+        return self.bdd.ite(self.root, self.bdd.build(query), 1) == 1
+
+    def ask(self, query: Sentence) -> str:
+        if not self.root: return YES
+        q = self.bdd.build(query)
+        return _verdict(self.bdd.conjoin(self.root, q) != 0, self.bdd.ite(q, 0, self.root) != 0)
+
+    def count(self, all_symbols=None) -> int:
+        names = set(_model_symbols(self.knowledge, all_symbols))
+        order = set(self.bdd.order)
+        total = self.bdd.count(self.root) << len(names - order)
+        return total >> len(order - names)
+
+    def _priors(self, priors) -> List[float]:
+        priors = _prior_names(priors)
+        return [priors.get(name, 0.5) for name in self.bdd.order]
+
+    def weighted_count(self, priors=None) -> float:
+        return self.bdd.weighted_marginals(self.root, self._priors(priors))[0]
+
+    def marginals(self, priors=None, all_symbols=None) -> Dict[str, float]:
+        total, true_mass = self.bdd.weighted_marginals(self.root, self._priors(priors))
+        if not total: raise ValueError("knowledge base is unsatisfiable")
+        names, level, priors = _model_symbols(self.knowledge, all_symbols), self.bdd.level, _prior_names(priors)
+        return {name: true_mass[level[name]] / total if name in level else priors.get(name, 0.5) for name in names}
+
+    def condition(self, evidence: Union[Sentence, Dict[str, bool]]) -> "CompiledKB":
+        if isinstance(evidence, dict):
+            evidence = And(*[Symbol(name) if value else Not(Symbol(name)) for name, value in evidence.items()])
+        return CompiledKB(self.bdd, self.bdd.conjoin(self.root, self.bdd.build(evidence)), And(self.knowledge, evidence))
+
+def compile_bdd(knowledge: Sentence, order: Optional[Sequence] = None) -> CompiledKB:
+    if order is None: order = bdd_order(knowledge)
+    bdd = BDD([s.name if isinstance(s, Symbol) else s for s in order])
+    return CompiledKB(bdd, bdd.build(knowledge), knowledge)
+
+def marginals(knowledge: Sentence, priors=None, all_symbols=None) -> Dict[str, float]:
+    return compile_bdd(knowledge).marginals(priors, all_symbols)
+
+def _bdd_model_check(knowledge, query, all_symbols):
+    names = {symbol.name for symbol in all_symbols}
+    if not (knowledge.symbols() <= names and query.symbols() <= names):
+        return _enumerate_model_check(knowledge, query, all_symbols)
+    return compile_bdd(knowledge).entails(query)
+
+def _bdd_entails_many(knowledge, queries, all_symbols):
+    names = {symbol.name for symbol in all_symbols}
+    if not knowledge.symbols().union(*[q.symbols() for q in queries]) <= names:
+        return _enumerate_entails_many(knowledge, queries, all_symbols)
+    compiled = compile_bdd(knowledge)
+    return [compiled.ask(q) for q in queries]
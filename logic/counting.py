@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Generator, Iterator, List, Optional
+
+from . import Sentence, Symbol, _satisfying_prefixes
+from .sat import CNF, CNFEncoder
+
+def _model_symbols(knowledge: Sentence, all_symbols) -> List[str]:
+    if all_symbols is None: return sorted(knowledge.symbols())
+    names = [s.name if isinstance(s, Symbol) else s for s in all_symbols]
+    missing = knowledge.symbols() - set(names)
+    if missing: raise ValueError(f"symbols {sorted(missing)} are not in all_symbols")
+    return names
+
+def _assign(clauses: List[tuple], lit: int) -> Optional[List[tuple]]:
+    out = []
+    for clause in clauses:
+        if lit in clause: continue
+        if -lit in clause:
+            clause = tuple(x for x in clause if x != -lit)
+            if not clause: return None
+        out.append(clause)
+    return out
+
+def _components(clauses: List[tuple]) -> List[List[tuple]]:
+    parent: Dict[int, int] = {}
+
+    def find(v: int) -> int:
+        while parent.setdefault(v, v) != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for clause in clauses:
+        root = find(abs(clause[0]))
+        for lit in clause[1:]: parent[find(abs(lit))] = root
+    groups: Dict[int, List[tuple]] = {}
+    for clause in clauses: groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return list(groups.values())
+
+def _propagate(clauses: List[tuple]) -> Optional[tuple]:
+    values: Dict[int, bool] = {}
+    queue = [c[0] for c in clauses if len(c) == 1]
+    if not queue: return clauses, values
+    occurs: Dict[int, List[tuple]] = {}
+    for clause in clauses:
+        for lit in clause: occurs.setdefault(abs(lit), []).append(clause)
+    while queue:
+        lit = queue.pop()
+        if abs(lit) in values:
+            if values[abs(lit)] != (lit > 0): return None
+            continue
+        values[abs(lit)] = lit > 0
+        for clause in occurs[abs(lit)]:
+            free = []
+            for x in clause:
+                value = values.get(abs(x))
+                if value is None: free.append(x)
+                elif value == (x > 0): break
+            else:
+                if not free: return None
+                if len(free) == 1: queue.append(free[0])
+    out = []
+    for clause in clauses:
+        if any(values.get(abs(x)) == (x > 0) for x in clause): continue
+        out.append(tuple(x for x in clause if abs(x) not in values))
+    return out, values
+
+def _count_steps(clauses: List[tuple], variables: FrozenSet[int], cache: Dict[frozenset, int]) -> Generator:
+    # yields (clauses, variables) sub-counts and is sent their results, so deep formulas don't recurse
+    propagated = _propagate(clauses)
+    if propagated is None: return 0
+    clauses, values = propagated
+    variables = variables - values.keys()
+    mentioned = frozenset(abs(lit) for clause in clauses for lit in clause)
+    total = 1 << len(variables - mentioned)
+    for component in _components(clauses):
+        key = frozenset(component)
+        if key not in cache:
+            occurrences: Dict[int, int] = {}
+            for clause in component:
+                for lit in clause: occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+            most = max(occurrences.values())
+            # the middle of the tied variables tends to split chains into two balanced components
+            tied = sorted(v for v, n in occurrences.items() if n == most)
+            var = tied[len(tied) // 2]
+            rest = frozenset(occurrences) - {var}
+            count = 0
+            for lit in (var, -var):
+                branch = _assign(component, lit)
+                if branch is not None: count += yield branch, rest
+            cache[key] = count
+        total *= cache[key]
+        if not total: return 0
+    return total
+
+def _count_clauses(clauses: List[tuple], variables: FrozenSet[int], cache: Dict[frozenset, int]) -> int:
+    stack = [_count_steps(clauses, variables, cache)]
+    result = None
+    while stack:
+        try:
+            branch, rest = stack[-1].send(result)
+        except StopIteration as done:
+            stack.pop()
+            result = done.value
+            continue
+        stack.append(_count_steps(branch, rest, cache))
+        result = None
+    return result
+
+def count_models(knowledge: Sentence, all_symbols=None) -> int:
+    names = _model_symbols(knowledge, all_symbols)
+    cnf = CNF()
+    cnf.add_clause([CNFEncoder(cnf).literal(knowledge)])
+    clauses = [tuple(sorted(set(clause))) for clause in cnf.clauses()]
+    clauses = [c for c in clauses if not any(-lit in c for lit in c)]
+    count = _count_clauses(clauses, frozenset(range(1, cnf.num_vars + 1)), {})
+    return count << (len(names) - len(knowledge.symbols()))
+
+def iter_models(knowledge: Sentence, all_symbols=None) -> Iterator[int]:
+    names = _model_symbols(knowledge, all_symbols)
+
+    def search() -> Iterator[int]:
+        for i, mask in _satisfying_prefixes(knowledge, names):
+            for bits in range(1 << (len(names) - i)): yield mask | (bits << i)
+
+    return search()
+
+def decode_model(mask: int, all_symbols) -> Dict[str, bool]:
+    names = [s.name if isinstance(s, Symbol) else s for s in all_symbols]
+    return {name: bool((mask >> i) & 1) for i, name in enumerate(names)}
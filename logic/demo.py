@@ -0,0 +1,70 @@
+from . import NO, YES, And, Not, Symbol, entails_many, exactly_one
+from .bdd import marginals
+
+herman = Symbol("Dr. herman")
+ahmad = Symbol("Col. ahmad")
+zhang = Symbol("Prof zhang niu")
+characters = [herman, ahmad, zhang]
+
+livingroom = Symbol("livingroom")
+kitchen = Symbol("kitchen")
+library = Symbol("library")
+rooms = [livingroom, kitchen, library]
+
+knife = Symbol("knife")
+revolver = Symbol("revolver")
+wrench = Symbol("wrench")
+weapons = [knife, revolver, wrench]
+
+all_symbols = characters + rooms + weapons
+
+knowledge_points = [
+    exactly_one(characters),
+    exactly_one(rooms),
+    exactly_one(weapons),
+]
+
+knowledge_points.append(Not(ahmad))  
+knowledge_points.append(Not(knife))   
+knowledge_points.append(Not(zhang)) 
+knowledge_points.append(Not(wrench))
+knowledge_points.append(Not(livingroom))
+knowledge_points.append(Not(kitchen))
+
+    
+
+knowledge = And(*knowledge_points)
+
+def check_knowledge(knowledge):
+    print("\n--- STATUS PENGETAHUAN ---")
+
+    know_true = []
+    know_false = []
+    verdicts = entails_many(knowledge, all_symbols, all_symbols)
+    probabilities = marginals(knowledge, all_symbols=all_symbols)
+    for symbol in all_symbols:
+        if verdicts[symbol] == YES:
+            print(f"✅ {symbol}: YES")
+            know_true.append(symbol)
+        elif verdicts[symbol] == NO:
+            know_false.append(symbol)
+        else:
+            print(f"🤔 {symbol}: MAYBE ({probabilities[symbol.name]:.0%})")
+
+    know_char = [s for s in know_true if s in characters]
+    know_waepon = [s for s in know_true if s in weapons]
+    know_room = [s for s in know_true if s in rooms]
+
+    if len(know_char) == 1 and len(know_room) == 1 and len(know_waepon) == 1:
+        char = characters[0]
+        weapon = weapons[0]
+        room = rooms[0]
+        print(f"the killer is {char} using {weapon} in {room}")
+    else:
+        print("there is no streng evidence ")
+
+def main():
+    check_knowledge(knowledge)
+
+if __name__ == "__main__":
+    main()
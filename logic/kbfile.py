@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from . import (And, AtLeastK, AtMostK, Biconditional, Cardinality, ExactlyOne, Implication, Not, Or, Sentence, Symbol,
+               _topological)
+from .sat import CNF
+
+KB_MAGIC = b"LGKB"
+KB_VERSION = 1
+_KB_HEADER = struct.Struct("<4s10I")
+_OPCODES = [Symbol, Not, And, Or, Implication, Biconditional, AtMostK, AtLeastK, ExactlyOne]
+
+def _flatten_nodes(sentences) -> tuple:
+    roots = [sentences] if isinstance(sentences, Sentence) else list(sentences)
+    nodes = _topological(roots)
+    index = {id(node): i for i, node in enumerate(nodes)}
+    opcodes = {cls: op for op, cls in enumerate(_OPCODES)}
+    names: Dict[str, int] = {}
+    ops, args, offsets, children = array("i"), array("i"), array("i", [0]), array("i")
+    for node in nodes:
+        ops.append(opcodes[type(node)])
+        if isinstance(node, Symbol):
+            args.append(names.setdefault(node.name, len(names)))
+        else:
+            args.append(node.k if isinstance(node, Cardinality) else 0)
+            children.extend(index[id(c)] for c in node._args() if isinstance(c, Sentence))
+        offsets.append(len(children))
+    return names, ops, args, offsets, children, array("i", (index[id(r)] for r in roots))
+
+def _rebuild(ops, args, offsets, children, symbols: List[str], roots) -> List[Sentence]:
+    nodes: List[Sentence] = []
+    for i, op in enumerate(ops):
+        cls = _OPCODES[op]
+        if cls is Symbol:
+            nodes.append(Symbol(symbols[args[i]]))
+            continue
+        kids = [nodes[c] for c in children[offsets[i]:offsets[i + 1]]]
+        nodes.append(cls(args[i], *kids) if cls in (AtMostK, AtLeastK) else cls(*kids))
+    return [nodes[r] for r in roots]
+
+def save_kb(path, sentences, cnf: Optional[CNF] = None):
+    names, ops, args, offsets, children, roots = _flatten_nodes(sentences)
+    cnf_literals, cnf_vars = array("i"), array("i")
+    if cnf is not None:
+        cnf_literals = array("i", cnf.literals)
+        for name in cnf.variables: names.setdefault(name, len(names))
+        cnf_vars = array("i", [cnf.variables.get(name, 0) for name in names])
+    encoded = [name.encode("utf-8") for name in names]
+    lengths = array("i", map(len, encoded))
+    sections = [ops, args, offsets, children, roots, cnf_literals, cnf_vars, lengths]
+    if sys.byteorder != "little":
+        for section in sections: section.byteswap()
+    blob = b"".join(encoded)
+    with open(path, "wb") as f:
+        f.write(_KB_HEADER.pack(KB_MAGIC, KB_VERSION, len(names), len(ops), len(children), len(roots),
+                                len(cnf_literals), len(cnf) if cnf is not None else 0,
+                                cnf.num_vars if cnf is not None else 0, len(cnf_vars), len(blob)))
+        for section in sections: f.write(section.tobytes())
+        f.write(blob)
+
+class KBFile:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _KB_HEADER.size: self._invalid(f"{path} is too short to be a knowledge base file")
+        (magic, self.version, num_symbols, num_nodes, num_children, num_roots,
+         num_literals, self.num_clauses, self.num_vars, num_cnf_vars, blob_size) = _KB_HEADER.unpack_from(self._mmap)
+        if magic != KB_MAGIC: self._invalid(f"{path} is not a knowledge base file")
+        if self.version != KB_VERSION: self._invalid(f"unsupported knowledge base version {self.version}")
+        sizes = [num_nodes, num_nodes, num_nodes + 1, num_children, num_roots, num_literals,
+                 num_cnf_vars, num_symbols]
+        if len(self._mmap) < _KB_HEADER.size + 4 * sum(sizes) + blob_size: self._invalid(f"{path} is truncated")
+        view = memoryview(self._mmap)
+        offset = _KB_HEADER.size
+        self._views = []
+        for size in sizes:
+            section = view[offset:offset + 4 * size].cast("i")
+            if sys.byteorder != "little":
+                section = array("i", section)
+                section.byteswap()
+            self._views.append(section)
+            offset += 4 * size
+        self.ops, self.args, self.offsets, self.children, self.roots, self.literals, self.cnf_vars, lengths = self._views
+        blob = bytes(view[offset:offset + blob_size])
+        self._views.append(view)
+        self.symbols: List[str] = []
+        start = 0
+        for length in lengths:
+            self.symbols.append(blob[start:start + length].decode("utf-8"))
+            start += length
+
+    def _invalid(self, message: str):
+        # no views exist yet, so the mapping can be closed before raising
+        self._mmap.close()
+        raise ValueError(message)
+
+    def sentences(self) -> List[Sentence]:
+        return _rebuild(self.ops, self.args, self.offsets, self.children, self.symbols, self.roots)
+
+    def cnf(self) -> CNF:
+        cnf = CNF()
+        cnf.literals = self.literals
+        cnf.num_vars, cnf.num_clauses = self.num_vars, self.num_clauses
+        cnf.variables = {name: var for name, var in zip(self.symbols, self.cnf_vars) if var}
+        return cnf
+
+    def close(self):
+        for view in self._views:
+            if isinstance(view, memoryview): view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> KBFile: return self
+    def __exit__(self, *exc_info): self.close()
+
+def load_kb(path) -> KBFile:
+    return KBFile(path)
+
+class FormulaArena:
+    """Sentences flattened into NumPy arrays, children before parents.
+
+    Node i has opcode ops[i] (an index into the save_kb opcode table), a symbol id
+    or cardinality bound in args[i], and children children[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, ops, args, offsets, children, roots, symbols: List[str]):
+        self.ops, self.args, self.offsets, self.children, self.roots = ops, args, offsets, children, roots
+        self.symbols = symbols
+
+    @classmethod
+    def from_sentences(cls, sentences) -> FormulaArena:
+        import numpy as np
+        names, ops, args, offsets, children, roots = _flatten_nodes(sentences)
+        arrays = [np.array(a, dtype=np.int32) for a in (args, offsets, children, roots)]
+        return cls(np.array(ops, dtype=np.uint8), *arrays, list(names))
+
+    def __len__(self) -> int: return len(self.ops)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.ops, self.args, self.offsets, self.children, self.roots))
+
+    def sentences(self) -> List[Sentence]:
+        return _rebuild(self.ops.tolist(), self.args.tolist(), self.offsets.tolist(), self.children.tolist(),
+                        self.symbols, self.roots.tolist())
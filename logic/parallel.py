@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Optional
+
+from . import EvaluationException, _enumerate_model_check, _evaluate_model_check
+
+_cube_state: Dict[str, Any] = {}
+
+def _init_cube_worker(stop, knowledge, query, all_symbols):
+    _cube_state.update(stop=stop, kb=knowledge.compile(all_symbols), query=query.compile(all_symbols), n=len(all_symbols))
+
+def _check_cube(prefix: tuple) -> bool:
+    stop, evaluate_kb, evaluate_query = _cube_state["stop"], _cube_state["kb"], _cube_state["query"]
+    rest = _cube_state["n"] - len(prefix)
+    inner = list(itertools.product([True, False], repeat=min(rest, 16)))
+    for middle in itertools.product([True, False], repeat=max(rest - 16, 0)):
+        if stop.is_set(): return True
+        head = prefix + middle
+        for tail in inner:
+            p = head + tail
+            if evaluate_kb(p) and not evaluate_query(p):
+                stop.set()
+                return False
+    return True
+
+def _parallel_model_check(knowledge, query, all_symbols, workers: Optional[int] = None, split_bits: Optional[int] = None):
+    try:
+        knowledge.compile(all_symbols), query.compile(all_symbols)
+    except EvaluationException:
+        return _evaluate_model_check(knowledge, query, all_symbols)
+    workers = workers or os.cpu_count() or 1
+    if split_bits is None: split_bits = (4 * workers - 1).bit_length()
+    split_bits = min(split_bits, len(all_symbols))
+    if workers == 1 or split_bits == 0:
+        return _enumerate_model_check(knowledge, query, all_symbols)
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(workers, initializer=_init_cube_worker, initargs=(stop, knowledge, query, list(all_symbols))) as pool:
+        futures = [pool.submit(_check_cube, prefix) for prefix in itertools.product([True, False], repeat=split_bits)]
+        try:
+            for future in as_completed(futures):
+                if not future.result(): return False
+        finally:
+            stop.set()
+            pool.shutdown(cancel_futures=True)
+    return True
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Iterator, List, Optional
+
+from . import And, AtLeastK, AtMostK, Biconditional, ExactlyOne, Implication, Not, Or, Sentence, Symbol
+
+class ParseError(ValueError):
+    pass
+
+_TOKEN = re.compile(r'\s*(?:(<=>|=>|[¬∧∨(),])|"((?:[^"\\]|\\.)*)"|((?:[^¬∧∨(),"<=]|<(?!=>)|=(?!>))+))')
+_INFIX = {"∧": (40, And), "∨": (30, Or), "=>": (20, Implication), "<=>": (10, Biconditional)}
+_RIGHT_ASSOCIATIVE = {"=>", "<=>"}
+_FUNCTIONS = {"ExactlyOne": ExactlyOne, "AtMostK": AtMostK, "AtLeastK": AtLeastK}
+
+def _tokenize(text: str) -> List[tuple]:
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos: raise ParseError(f"unexpected character {text[pos]!r} at {pos}")
+        operator, quoted, name = match.groups()
+        start = match.start(match.lastindex)
+        if operator is not None: tokens.append(("op", operator, start))
+        elif quoted is not None: tokens.append(("quoted", re.sub(r"\\(.)", r"\1", quoted), start))
+        else: tokens.append(("name", name.rstrip(), start))
+        pos = match.end()
+    return tokens
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self) -> Optional[tuple]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def at(self, operator: str) -> bool:
+        token = self.peek()
+        return token is not None and token[0] == "op" and token[1] == operator
+
+    def next(self) -> tuple:
+        token = self.peek()
+        if token is None: raise ParseError("unexpected end of formula")
+        self.pos += 1
+        return token
+
+    def expect(self, operator: str):
+        kind, value, start = self.next()
+        if kind != "op" or value != operator: raise ParseError(f"expected {operator!r} at {start}, got {value!r}")
+
+    def parse(self) -> Sentence:
+        sentence = self.expression()
+        token = self.peek()
+        if token is not None: raise ParseError(f"unexpected {token[1]!r} at {token[2]}")
+        return sentence
+
+    def expression(self) -> Sentence:
+        # operator-precedence parsing with explicit stacks, so long chains don't recurse
+        operands: List[Sentence] = []
+        operators: List[Optional[tuple]] = []  # (power, cls), None for an open parenthesis
+        depth = 0
+        while True:
+            kind, value, start = self.next()
+            while kind == "op" and value in ("¬", "("):
+                if value == "(": depth += 1
+                operators.append((50, Not) if value == "¬" else None)
+                kind, value, start = self.next()
+            operands.append(self.atom(kind, value, start))
+            while depth and self.at(")"):
+                self.reduce(operands, operators, 0)
+                operators.pop()
+                depth -= 1
+                self.pos += 1
+            token = self.peek()
+            if token is None or token[0] != "op" or token[1] not in _INFIX:
+                if depth: self.expect(")")
+                self.reduce(operands, operators, 0)
+                return operands[0]
+            power, cls = _INFIX[token[1]]
+            self.reduce(operands, operators, power + 1 if token[1] in _RIGHT_ASSOCIATIVE else power)
+            operators.append((power, cls))
+            self.pos += 1
+
+    @staticmethod
+    def reduce(operands: List[Sentence], operators: List[Optional[tuple]], min_power: int):
+        while operators and operators[-1] is not None and operators[-1][0] >= min_power:
+            _, cls = operators.pop()
+            if cls is Not:
+                operands.append(Not(operands.pop()))
+            else:
+                right = operands.pop()
+                operands.append(cls(operands.pop(), right))
+
+    def atom(self, kind: str, value: str, start: int) -> Sentence:
+        if kind == "quoted": return Symbol(value)
+        if kind == "name":
+            if value in _FUNCTIONS and self.at("("): return self.call(_FUNCTIONS[value])
+            if value == "True": return And()
+            if value == "False": return Or()
+            return Symbol(value)
+        raise ParseError(f"unexpected {value!r} at {start}")
+
+    def call(self, cls: type) -> Sentence:
+        self.expect("(")
+        args: List[Any] = []
+        if cls is not ExactlyOne:
+            kind, value, start = self.next()
+            if kind != "name" or not value.isdigit(): raise ParseError(f"expected integer bound at {start}, got {value!r}")
+            args.append(int(value))
+            if not self.at(")"): self.expect(",")
+        while not self.at(")"):
+            args.append(self.expression())
+            if not self.at(","): break
+            self.pos += 1
+        self.expect(")")
+        return cls(*args)
+
+def parse(text: str) -> Sentence:
+    return _Parser(text).parse()
+
+def load_rules(source) -> Iterator[Sentence]:
+    lines = open(source, encoding="utf-8") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            try:
+                yield parse(line)
+            except ParseError as e:
+                raise ParseError(f"line {number}: {e}") from None
+    finally:
+        if lines is not source: lines.close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from . import BACKENDS, BATCH_BACKENDS, EvaluationCache, Sentence, vectorized
+from .sat import SATSolver
+
+class ProfileStats:
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.partial_calls: Counter = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.models_visited = 0
+        self.solver: Counter = Counter()
+        self.model_checks: List[tuple] = []
+        self.batches: List[tuple] = []
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": dict(self.calls), "partial_calls": dict(self.partial_calls),
+            "cache_hits": self.cache_hits, "cache_misses": self.cache_misses, "models_visited": self.models_visited,
+            "solver": dict(self.solver), "model_checks": self.model_checks, "batches": self.batches,
+        }
+
+def _sentence_classes() -> List[type]:
+    found, stack = [], [Sentence]
+    while stack:
+        cls = stack.pop()
+        found.append(cls)
+        stack.extend(cls.__subclasses__())
+    return found
+
+@contextlib.contextmanager
+def profile() -> Iterator[ProfileStats]:
+    stats = ProfileStats()
+    patches: List[tuple] = []
+
+    def patch(owner: Any, name: str, make: Callable[[Any], Any]):
+        original = owner[name] if isinstance(owner, dict) else owner.__dict__[name]
+        patches.append((owner, name, original))
+        if isinstance(owner, dict): owner[name] = make(original)
+        else: setattr(owner, name, make(original))
+
+    def counted(counter: Counter, original: Callable) -> Callable:
+        def wrapper(self, *args):
+            counter[type(self).__name__] += 1
+            return original(self, *args)
+        return wrapper
+
+    def cached(original: Callable) -> Callable:
+        def wrapper(cache, sentence, model):
+            if cache._depth: return original(cache, sentence, model)
+            hits, misses = cache.hits, cache.misses
+            try:
+                return original(cache, sentence, model)
+            finally:
+                stats.cache_hits += cache.hits - hits
+                stats.cache_misses += cache.misses - misses
+        return wrapper
+
+    def assignments(original: Callable) -> Callable:
+        def wrapper(n: int) -> Iterator[tuple]:
+            for p in original(n):
+                stats.models_visited += 1
+                yield p
+        return wrapper
+
+    def chunks(original: Callable) -> Callable:
+        def wrapper(sentences, all_symbols, *args, **kwargs):
+            for first, bits in original(sentences, all_symbols, *args, **kwargs):
+                stats.models_visited += min(64 * len(bits[0]), (1 << len(all_symbols)) - first)
+                yield first, bits
+        return wrapper
+
+    def solving(original: Callable) -> Callable:
+        def wrapper(solver, *args):
+            before = (solver.conflicts, solver.decisions, solver.propagations)
+            try:
+                return original(solver, *args)
+            finally:
+                stats.solver["solves"] += 1
+                stats.solver["conflicts"] += solver.conflicts - before[0]
+                stats.solver["decisions"] += solver.decisions - before[1]
+                stats.solver["propagations"] += solver.propagations - before[2]
+        return wrapper
+
+    def timed(log: List[tuple], backend: str) -> Callable[[Callable], Callable]:
+        def make(original: Callable) -> Callable:
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    log.append((backend, time.perf_counter() - start))
+            return wrapper
+        return make
+
+    try:
+        for cls in _sentence_classes():
+            if "_evaluate" in cls.__dict__: patch(cls, "_evaluate", lambda f: counted(stats.calls, f))
+            if "_partial" in cls.__dict__: patch(cls, "_partial", lambda f: counted(stats.partial_calls, f))
+        patch(EvaluationCache, "evaluate", cached)
+        patch(SATSolver, "solve", solving)
+        patch(vars(sys.modules[__package__]), "_assignments", assignments)
+        patch(vars(vectorized), "truth_table_bits", chunks)
+        for name in list(BACKENDS): patch(BACKENDS, name, timed(stats.model_checks, name))
+        for name in list(BATCH_BACKENDS): patch(BATCH_BACKENDS, name, timed(stats.batches, name))
+        yield stats
+    finally:
+        for owner, name, original in reversed(patches):
+            if isinstance(owner, dict): owner[name] = original
+            else: setattr(owner, name, original)
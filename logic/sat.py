@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from . import (YES, And, Biconditional, Cardinality, Implication, Not, Or, Sentence, Symbol,
+               _enumerate_model_check, _model_check_many, _verdict)
+
+class SATSolver:
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses: List[List[int]] = []
+        self.watches: List[List[int]] = [[], []]
+        self.value: List[int] = [0]
+        self.level: List[int] = [0]
+        self.reason: List[int] = [-1]
+        self.activity: List[float] = [0.0]
+        self.polarity: List[bool] = [False]
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.heap: List[tuple] = []
+        self.bump = 1.0
+        self.ok = True
+        self.model: Dict[int, bool] = {}
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        self.watches.extend(([], []))
+        self.value.append(0)
+        self.level.append(0)
+        self.reason.append(-1)
+        self.activity.append(0.0)
+        self.polarity.append(False)
+        heapq.heappush(self.heap, (0.0, self.num_vars))
+        return self.num_vars
+
+    @staticmethod
+    def _index(lit: int) -> int: return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def _lit_value(self, lit: int) -> int:
+        v = self.value[abs(lit)]
+        return v if lit > 0 else -v
+
+    def add_clause(self, lits) -> bool:
+        if not self.ok: return False
+        self._cancel_until(0)
+        clause: List[int] = []
+        for lit in lits:
+            while abs(lit) > self.num_vars: self.new_var()
+            value = self._lit_value(lit)
+            if value == 1 or -lit in clause: return True
+            if value == 0 and lit not in clause: clause.append(lit)
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], -1)
+            self.ok = self._propagate() is None
+            return self.ok
+        self._attach(clause)
+        return True
+
+    def add_cnf(self, cnf: CNF) -> bool:
+        return all([self.add_clause(clause) for clause in cnf.clauses()])
+
+    def _attach(self, clause: List[int]) -> int:
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[self._index(clause[0])].append(index)
+        self.watches[self._index(clause[1])].append(index)
+        return index
+
+    def _enqueue(self, lit: int, reason: int):
+        var = abs(lit)
+        self.value[var] = 1 if lit > 0 else -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> Optional[int]:
+        value, clauses, watches, index_of = self.value, self.clauses, self.watches, self._index
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            ws = watches[index_of(false_lit)]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c[0] == false_lit: c[0], c[1] = c[1], false_lit
+                first = c[0]
+                first_value = value[first] if first > 0 else -value[-first]
+                if first_value == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    if (value[lit] if lit > 0 else -value[-lit]) != -1:
+                        c[1], c[k] = lit, false_lit
+                        watches[index_of(lit)].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if first_value == -1:
+                        while i < n:
+                            ws[j] = ws[i]
+                            i += 1
+                            j += 1
+                        del ws[j:]
+                        self.qhead = len(self.trail)
+                        return ci
+                    self._enqueue(first, ci)
+            del ws[j:]
+        return None
+
+    def _bump_var(self, var: int):
+        self.activity[var] += self.bump
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.bump *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if not self.value[v]]
+            heapq.heapify(self.heap)
+        elif not self.value[var]:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict: int):
+        seen = set()
+        learnt = [0]
+        counter = 0
+        lit = 0
+        index = len(self.trail) - 1
+        current = len(self.trail_lim)
+        while True:
+            clause = self.clauses[conflict]
+            for q in (clause if lit == 0 else clause[1:]):
+                var = abs(q)
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    self._bump_var(var)
+                    if self.level[var] >= current: counter += 1
+                    else: learnt.append(q)
+            while abs(self.trail[index]) not in seen: index -= 1
+            lit = self.trail[index]
+            index -= 1
+            seen.discard(abs(lit))
+            counter -= 1
+            if counter == 0: break
+            conflict = self.reason[abs(lit)]
+        learnt[0] = -lit
+        self.bump *= 1.05
+        if len(learnt) == 1: return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _cancel_until(self, level: int):
+        if len(self.trail_lim) <= level: return
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = abs(lit)
+            self.value[var] = 0
+            self.reason[var] = -1
+            self.polarity[var] = lit > 0
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self) -> int:
+        while self.heap:
+            _, var = heapq.heappop(self.heap)
+            if not self.value[var]: return var if self.polarity[var] else -var
+        return 0
+
+    @staticmethod
+    def _luby(i: int) -> int:
+        size, seq = 1, 0
+        while size < i + 1:
+            seq += 1
+            size = 2 * size + 1
+        while size - 1 != i:
+            size = (size - 1) >> 1
+            seq -= 1
+            i %= size
+        return 1 << seq
+
+    def solve(self, assumptions=()) -> bool:
+        self.model = {}
+        if not self.ok: return False
+        for lit in assumptions:
+            while abs(lit) > self.num_vars: self.new_var()
+        self._cancel_until(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        restarts = 0
+        budget = 100 * self._luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                budget -= 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learnt) == 1: self._enqueue(learnt[0], -1)
+                else: self._enqueue(learnt[0], self._attach(learnt))
+                continue
+            if budget <= 0:
+                restarts += 1
+                budget = 100 * self._luby(restarts)
+                self._cancel_until(0)
+                continue
+            lit = 0
+            while len(self.trail_lim) < len(assumptions):
+                assumed = assumptions[len(self.trail_lim)]
+                value = self._lit_value(assumed)
+                if value == -1:
+                    self._cancel_until(0)
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value == 0:
+                    lit = assumed
+                    break
+            if not lit:
+                lit = self._pick_branch()
+                if not lit:
+                    self.model = {v: self.value[v] == 1 for v in range(1, self.num_vars + 1)}
+                    self._cancel_until(0)
+                    return True
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, -1)
+
+
+class CNF:
+    def __init__(self):
+        self.literals = array("i")
+        self.num_vars = 0
+        self.num_clauses = 0
+        self.variables: Dict[str, int] = {}
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        return self.num_vars
+
+    def variable(self, name: str) -> int:
+        if name not in self.variables: self.variables[name] = self.new_var()
+        return self.variables[name]
+
+    def add_clause(self, lits) -> bool:
+        for lit in lits:
+            self.literals.append(lit)
+            self.num_vars = max(self.num_vars, abs(lit))
+        self.literals.append(0)
+        self.num_clauses += 1
+        return True
+
+    def clauses(self) -> Iterator[List[int]]:
+        clause: List[int] = []
+        for lit in self.literals:
+            if lit: clause.append(lit)
+            else:
+                yield clause
+                clause = []
+
+    def __len__(self) -> int: return self.num_clauses
+
+    def to_dimacs(self) -> str:
+        lines = [f"p cnf {self.num_vars} {self.num_clauses}"]
+        lines.extend(" ".join(map(str, clause + [0])) for clause in self.clauses())
+        return "\n".join(lines) + "\n"
+
+
+class CNFEncoder:
+    def __init__(self, sink: Union[SATSolver, CNF]):
+        self.sink = sink
+        self.variables: Dict[str, int] = {}
+        self._literals: Dict[int, tuple] = {}
+        self._true = 0
+
+    def variable(self, name: str) -> int:
+        if name not in self.variables: self.variables[name] = self.sink.new_var()
+        return self.variables[name]
+
+    def _constant(self, value: bool) -> int:
+        if not self._true:
+            self._true = self.sink.new_var()
+            self.sink.add_clause([self._true])
+        return self._true if value else -self._true
+
+    def literal(self, sentence: Sentence) -> int:
+        stack = [(sentence, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in self._literals: continue
+            if expanded or isinstance(node, Symbol):
+                self._literals[id(node)] = (node, self._encode(node))
+                continue
+            stack.append((node, True))
+            stack.extend((c, False) for c in node._args() if isinstance(c, Sentence) and id(c) not in self._literals)
+        return self._literals[id(sentence)][1]
+
+    def _encode(self, sentence: Sentence) -> int:
+        add = self.sink.add_clause
+        child = lambda c: self._literals[id(c)][1]
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -child(sentence.operand)
+        if isinstance(sentence, And):
+            return self._and([child(c) for c in sentence.conjuncts])
+        if isinstance(sentence, Or):
+            return self._or([child(d) for d in sentence.disjuncts])
+        if isinstance(sentence, Implication):
+            a, b = child(sentence.antecedent), child(sentence.consequent)
+            lit = self.sink.new_var()
+            add([-lit, -a, b]); add([lit, a]); add([lit, -b])
+            return lit
+        if isinstance(sentence, Biconditional):
+            a, b = child(sentence.left), child(sentence.right)
+            lit = self.sink.new_var()
+            add([-lit, -a, b]); add([-lit, a, -b]); add([lit, a, b]); add([lit, -a, -b])
+            return lit
+        if isinstance(sentence, Cardinality):
+            low, high = sentence.bounds()
+            counts = self._counter([child(o) for o in sentence.operands], low if high is None else high + 1)
+            at_least = lambda j: self._constant(True) if j <= 0 else counts[j - 1] if j <= len(counts) else self._constant(False)
+            return at_least(low) if high is None else self._and([at_least(low), -at_least(high + 1)])
+        raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+    def _and(self, lits: List[int]) -> int:
+        if not lits: return self._constant(True)
+        if len(lits) == 1: return lits[0]
+        out = self.sink.new_var()
+        for lit in lits: self.sink.add_clause([-out, lit])
+        self.sink.add_clause([out] + [-lit for lit in lits])
+        return out
+
+    def _or(self, lits: List[int]) -> int: return -self._and([-lit for lit in lits])
+
+    def _counter(self, lits: List[int], k: int) -> List[int]:
+        counts: List[int] = []
+        for x in lits:
+            step = []
+            for j in range(min(k, len(counts) + 1)):
+                carry = x if j == 0 else self._and([x, counts[j - 1]])
+                step.append(self._or([counts[j], carry]) if j < len(counts) else carry)
+            counts = step
+        return counts
+
+    def _at_most(self, lits: List[int], k: int) -> List[List[int]]:
+        n = len(lits)
+        if k >= n: return []
+        if k == 0: return [[-x] for x in lits]
+        s = [[self.sink.new_var() for _ in range(k)] for _ in range(n - 1)]
+        clauses = [[-lits[0], s[0][0]]] + [[-s[0][j]] for j in range(1, k)]
+        for i in range(1, n - 1):
+            clauses += [[-lits[i], s[i][0]], [-s[i - 1][0], s[i][0]]]
+            for j in range(1, k):
+                clauses += [[-lits[i], -s[i - 1][j - 1], s[i][j]], [-s[i - 1][j], s[i][j]]]
+            clauses.append([-lits[i], -s[i - 1][k - 1]])
+        clauses.append([-lits[-1], -s[n - 2][k - 1]])
+        return clauses
+
+    def _cardinality_clauses(self, sentence: Cardinality) -> List[List[int]]:
+        lits = [self.literal(o) for o in sentence.operands]
+        low, high = sentence.bounds()
+        clauses = [] if high is None else self._at_most(lits, high)
+        if low == 1: clauses.append(lits)
+        elif low > len(lits): clauses.append([])
+        elif low: clauses += self._at_most([-x for x in lits], len(lits) - low)
+        return clauses
+
+    def add(self, sentence: Sentence, guard: int = 0) -> bool:
+        if isinstance(sentence, And):
+            return all([self.add(c, guard) for c in sentence.conjuncts])
+        if isinstance(sentence, Or):
+            clauses = [[self.literal(d) for d in sentence.disjuncts]]
+        elif isinstance(sentence, Implication):
+            clauses = [[-self.literal(sentence.antecedent), self.literal(sentence.consequent)]]
+        elif isinstance(sentence, Cardinality):
+            clauses = self._cardinality_clauses(sentence)
+        else:
+            clauses = [[self.literal(sentence)]]
+        return all([self.sink.add_clause(clause + [-guard] if guard else clause) for clause in clauses])
+
+def _distribute(left: List[List[int]], right: List[List[int]]) -> List[List[int]]:
+    clauses = []
+    for a in left:
+        for b in right:
+            clause = list(dict.fromkeys(a + b))
+            if not any(-lit in clause for lit in clause): clauses.append(clause)
+    return clauses
+
+def _nnf_clauses(sentence: Sentence, positive: bool, variable: Callable[[str], int]) -> List[List[int]]:
+    if isinstance(sentence, Symbol):
+        lit = variable(sentence.name)
+        return [[lit if positive else -lit]]
+    if isinstance(sentence, Not):
+        return _nnf_clauses(sentence.operand, not positive, variable)
+    if isinstance(sentence, (And, Or)):
+        children = sentence.conjuncts if isinstance(sentence, And) else sentence.disjuncts
+        parts = [_nnf_clauses(c, positive, variable) for c in children]
+        if isinstance(sentence, And) == positive: return [c for part in parts for c in part]
+        clauses: List[List[int]] = [[]]
+        for part in parts: clauses = _distribute(clauses, part)
+        return clauses
+    if isinstance(sentence, Implication):
+        a, b = sentence.antecedent, sentence.consequent
+        if positive: return _distribute(_nnf_clauses(a, False, variable), _nnf_clauses(b, True, variable))
+        return _nnf_clauses(a, True, variable) + _nnf_clauses(b, False, variable)
+    if isinstance(sentence, Biconditional):
+        a, b = sentence.left, sentence.right
+        return (_distribute(_nnf_clauses(a, not positive, variable), _nnf_clauses(b, True, variable))
+                + _distribute(_nnf_clauses(a, positive, variable), _nnf_clauses(b, False, variable)))
+    if isinstance(sentence, Cardinality):
+        return _nnf_clauses(sentence.expand(), positive, variable)
+    raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+def to_cnf(sentence: Sentence, mode: str = "tseitin") -> CNF:
+    cnf = CNF()
+    if mode == "tseitin":
+        encoder = CNFEncoder(cnf)
+        encoder.add(sentence)
+        cnf.variables = encoder.variables
+    elif mode == "distribute":
+        for clause in _nnf_clauses(sentence, True, cnf.variable): cnf.add_clause(clause)
+    else:
+        raise ValueError(f"unknown CNF mode {mode!r}, expected 'tseitin' or 'distribute'")
+    return cnf
+
+def _sat_model_check(knowledge, query, all_symbols):
+    names = {symbol.name for symbol in all_symbols}
+    if not (knowledge.symbols() <= names and query.symbols() <= names):
+        return _enumerate_model_check(knowledge, query, all_symbols)
+    solver = SATSolver()
+    encoder = CNFEncoder(solver)
+    if not encoder.add(knowledge): return True
+    return not solver.solve([-encoder.literal(query)])
+
+def _sat_entails_many(knowledge, queries, all_symbols):
+    names = {symbol.name for symbol in all_symbols}
+    if not (knowledge.symbols() <= names and all(q.symbols() <= names for q in queries)):
+        return _model_check_many(knowledge, queries, all_symbols, "enumerate")
+    solver = SATSolver()
+    encoder = CNFEncoder(solver)
+    if not encoder.add(knowledge): return [YES] * len(queries)
+    literals = [encoder.literal(q) for q in queries]
+    can_be_true = [False] * len(queries)
+    can_be_false = [False] * len(queries)
+
+    def solve(assumptions) -> bool:
+        if not solver.solve(assumptions): return False
+        for i, lit in enumerate(literals):
+            if solver.model[abs(lit)] == (lit > 0): can_be_true[i] = True
+            else: can_be_false[i] = True
+        return True
+
+    if not solve([]): return [YES] * len(queries)
+    for i, lit in enumerate(literals):
+        if not can_be_false[i]: solve([-lit])
+        if not can_be_true[i]: solve([lit])
+    return [_verdict(t, f) for t, f in zip(can_be_true, can_be_false)]
+
+class KnowledgeBase:
+    def __init__(self, *sentences: Sentence):
+        self.solver = SATSolver()
+        self.encoder = CNFEncoder(self.solver)
+        self.sentences: List[Sentence] = []
+        self._scopes: List[tuple] = []
+        self._model: Optional[Dict[str, bool]] = None
+        for sentence in sentences: self.add(sentence)
+
+    @property
+    def knowledge(self) -> And: return And(*self.sentences)
+
+    def add(self, sentence: Sentence):
+        Sentence.validate(sentence)
+        holds = self._holds(sentence)
+        self.encoder.add(sentence, self._scopes[-1][0] if self._scopes else 0)
+        self.sentences.append(sentence)
+        if holds is not True: self._model = None
+
+    def push(self):
+        self._scopes.append((self.solver.new_var(), len(self.sentences)))
+
+    def pop(self):
+        if not self._scopes: raise IndexError("pop from knowledge base without scope")
+        selector, size = self._scopes.pop()
+        self.solver.add_clause([-selector])
+        del self.sentences[size:]
+
+    def _solve(self, assumptions=()) -> bool:
+        if not self.solver.solve([selector for selector, _ in self._scopes] + list(assumptions)): return False
+        self._model = {name: self.solver.model[var] for name, var in self.encoder.variables.items()}
+        return True
+
+    def _holds(self, sentence: Sentence) -> Optional[bool]:
+        if self._model is None or not sentence.symbols() <= self._model.keys(): return None
+        return sentence.evaluate_partial(self._model)
+
+    def satisfiable(self) -> bool:
+        return self._model is not None or self._solve()
+
+    def ask(self, query: Sentence) -> str:
+        if not self.satisfiable(): return YES
+        lit = self.encoder.literal(query)
+        holds = self._holds(query)
+        can_be_true = holds is True or self._solve([lit])
+        can_be_false = holds is False or self._solve([-lit])
+        return _verdict(can_be_true, can_be_false)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from . import EvaluationException, Sentence, Symbol, _evaluate_model_check, _model_check_many, _verdict
+
+MEMORY_BUDGET = 64 << 20
+_WORD_PATTERNS = (
+    0xAAAAAAAAAAAAAAAA, 0xCCCCCCCCCCCCCCCC, 0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00, 0xFFFF0000FFFF0000, 0xFFFFFFFF00000000,
+)
+
+def truth_table_bits(sentences: Sequence[Sentence], all_symbols, memory_budget: int = MEMORY_BUDGET):
+    """Yield (first_model, [words per sentence]) chunks of the packed truth table.
+
+    Model m assigns True to all_symbols[i] iff bit i of m is set; bit m % 64 of
+    word m // 64 holds the value of a sentence in model m.
+    """
+    import numpy as np
+    names = [s.name if isinstance(s, Symbol) else s for s in all_symbols]
+    n = len(names)
+    total_words = max(1, (1 << n) >> 6)
+    chunk = max(1, min(total_words, memory_budget // (8 * (n + 4 * len(sentences) + 4))))
+    one = np.uint64(1)
+    for start in range(0, total_words, chunk):
+        words = np.arange(start, min(start + chunk, total_words), dtype=np.uint64)
+        ones = np.full(len(words), np.iinfo(np.uint64).max, dtype=np.uint64)
+        if n < 6: ones &= np.uint64((1 << (1 << n)) - 1)
+        columns = {}
+        for i, name in enumerate(names):
+            if i < 6: columns[name] = ones & np.uint64(_WORD_PATTERNS[i])
+            else: columns[name] = ((words >> np.uint64(i - 6)) & one) * ones
+        yield start << 6, [s._bits(columns, ones) & ones for s in sentences]
+
+def _numpy_model_check(knowledge, query, all_symbols, memory_budget: int = MEMORY_BUDGET):
+    try:
+        for _, (kb, q) in truth_table_bits([knowledge, query], all_symbols, memory_budget):
+            if (kb & ~q).any(): return False
+    except EvaluationException:
+        return _evaluate_model_check(knowledge, query, all_symbols)
+    return True
+
+def _numpy_entails_many(knowledge, queries, all_symbols, memory_budget: int = MEMORY_BUDGET):
+    can_be_true = [False] * len(queries)
+    can_be_false = [False] * len(queries)
+    try:
+        for _, (kb, *bits) in truth_table_bits([knowledge, *queries], all_symbols, memory_budget):
+            for i, q in enumerate(bits):
+                can_be_true[i] = can_be_true[i] or bool((kb & q).any())
+                can_be_false[i] = can_be_false[i] or bool((kb & ~q).any())
+            if all(can_be_true) and all(can_be_false): break
+    except EvaluationException:
+        return _model_check_many(knowledge, queries, all_symbols, "enumerate")
+    return [_verdict(t, f) for t, f in zip(can_be_true, can_be_false)]
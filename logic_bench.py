@@ -0,0 +1,166 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import logic
+from logic import And, Not, Or, Implication, Symbol, ExactlyOne
+from logic import demo
+
+ENUMERATION_BACKENDS = {"enumerate", "numpy", "parallel", "backtrack"}
+
+
+def clue(n, seed=0):
+    rng = random.Random(seed)
+    groups = [[Symbol(f"{kind}{i}") for i in range(n)] for kind in ("character", "room", "weapon")]
+    facts = [ExactlyOne(*group) for group in groups]
+    for group in groups:
+        culprit = rng.choice(group)
+        facts.extend(Not(s) for s in group if s is not culprit and rng.random() < 0.8)
+    symbols = [s for group in groups for s in group]
+    return And(*facts), symbols, symbols
+
+
+def random_3sat(n, ratio=4.26, seed=0):
+    rng = random.Random(seed)
+    symbols = [Symbol(f"x{i}") for i in range(n)]
+    clauses = [Or(*[s if rng.random() < 0.5 else Not(s) for s in rng.sample(symbols, 3)]) for _ in range(int(n * ratio))]
+    return And(*clauses), symbols, symbols[:10]
+
+
+def pigeonhole(holes):
+    pigeons = holes + 1
+    p = [[Symbol(f"p{i}_{j}") for j in range(holes)] for i in range(pigeons)]
+    facts = [Or(*row) for row in p]
+    facts += [Or(Not(p[i][j]), Not(p[k][j])) for j in range(holes) for i in range(pigeons) for k in range(i + 1, pigeons)]
+    symbols = [s for row in p for s in row]
+    return And(*facts), symbols, symbols[:1]
+
+
+def implication_chain(depth):
+    symbols = [Symbol(f"c{i}") for i in range(depth + 1)]
+    facts = [symbols[0]] + [Implication(a, b) for a, b in zip(symbols, symbols[1:])]
+    return And(*facts), symbols, symbols[-1:]
+
+
+GENERATORS = {
+    "clue": lambda size: clue(size),
+    "random_3sat": lambda size: random_3sat(size),
+    "pigeonhole": lambda size: pigeonhole(size),
+    "implication_chain": lambda size: implication_chain(size),
+}
+
+
+def measure(fn, repeat=1):
+    # tracemalloc slows allocation-heavy code down, so time and peak memory come from separate passes
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+@contextlib.contextmanager
+def unsimplified():
+    # model_check and entails_many look simplify up at call time, so swapping it out hands backends the raw knowledge base
+    original = logic.simplify
+    logic.simplify = lambda sentence: sentence
+    try:
+        yield
+    finally:
+        logic.simplify = original
+
+
+def run_case(family, size, backend, repeat=1, simplify=True):
+    knowledge, symbols, queries = GENERATORS[family](size)
+    _, simplify_elapsed, _ = measure(lambda: logic.simplify(knowledge), repeat)
+    with contextlib.nullcontext() if simplify else unsimplified():
+        _, elapsed, peak = measure(lambda: [logic.model_check(knowledge, q, symbols, backend) for q in queries], repeat)
+        _, batch_elapsed, batch_peak = measure(lambda: logic.entails_many(knowledge, queries, symbols, backend), repeat)
+        with logic.profile() as stats:
+            for q in queries: logic.model_check(knowledge, q, symbols, backend)
+    evaluations = sum(stats.calls.values()) + sum(stats.partial_calls.values())
+    return {
+        "family": family,
+        "size": size,
+        "backend": backend,
+        "symbols": len(symbols),
+        "queries": len(queries),
+        "simplified": simplify,
+        "simplify_seconds": simplify_elapsed,
+        "model_check_seconds": elapsed,
+        "model_check_peak_bytes": peak,
+        "checks_per_second": len(queries) / elapsed if elapsed else None,
+        "models_visited": stats.models_visited,
+        "models_per_second": stats.models_visited / elapsed if elapsed and stats.models_visited else None,
+        "calls": dict(stats.calls),
+        "partial_calls": dict(stats.partial_calls),
+        "evaluations_per_second": evaluations / elapsed if elapsed and evaluations else None,
+        "solver": dict(stats.solver),
+        "entails_many_seconds": batch_elapsed,
+        "entails_many_peak_bytes": batch_peak,
+    }
+
+
+def run_check_knowledge(repeat=1):
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, elapsed, peak = measure(lambda: demo.check_knowledge(demo.knowledge), repeat)
+    return {"family": "check_knowledge", "size": len(demo.all_symbols), "seconds": elapsed, "peak_bytes": peak}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the logic entailment backends.")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--backends", default=",".join(sorted(logic.BACKENDS)))
+    parser.add_argument("--families", default=",".join(GENERATORS))
+    parser.add_argument("--sizes", default="3,6,12")
+    parser.add_argument("--max-enumerate-symbols", type=int, default=20)
+    parser.add_argument("--max-bdd-symbols", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-simplify", action="store_true", help="hand backends the knowledge base without simplify()")
+    args = parser.parse_args(argv)
+
+    results = [run_check_knowledge(args.repeat)]
+    for family in args.families.split(","):
+        for size in map(int, args.sizes.split(",")):
+            for backend in args.backends.split(","):
+                symbols = len(GENERATORS[family](size)[1])
+                if backend in ENUMERATION_BACKENDS and symbols > args.max_enumerate_symbols: continue
+                if backend == "bdd" and symbols > args.max_bdd_symbols: continue
+                result = run_case(family, size, backend, args.repeat, simplify=not args.no_simplify)
+                print(f"{family:18} {size:4} {backend:10} {result['model_check_seconds']:.4f}s")
+                results.append(result)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
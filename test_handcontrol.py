@@ -0,0 +1,53 @@
+import json
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("cv2")
+
+import handcontrol
+
+
+def run_main(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, "argv", ["handcontrol.py", *args])
+    handcontrol.main()
+    return json.loads(capsys.readouterr().out)
+
+
+def test_headless_synthetic_report(monkeypatch, capsys):
+    report = run_main(monkeypatch, capsys, "--synthetic", "40")
+    assert report["frames"] == 40
+    assert report["processed"] == 39
+    assert report["events"]
+
+
+def test_headless_accepts_zero_synthetic_frames(monkeypatch, capsys):
+    report = run_main(monkeypatch, capsys, "--synthetic", "0")
+    assert report["frames"] == 0
+    assert report["fps"] == 0.0
+
+
+def test_headless_rejects_missing_source(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "argv", ["handcontrol.py", "--source", str(tmp_path / "missing.mp4")])
+    with pytest.raises(SystemExit):
+        handcontrol.main()
+
+
+def test_ring_buffer_is_fifo_and_drops_the_oldest_item():
+    buffer = handcontrol.RingBuffer(size=2)
+    for item in range(3): buffer.put(item)
+    assert buffer.dropped == 1
+    assert [buffer.get(), buffer.get()] == [1, 2]
+    buffer.close()
+    assert buffer.get() is None
+
+
+def test_ring_buffer_without_drop_waits_for_space():
+    buffer = handcontrol.RingBuffer(size=1, drop=False)
+    producer = threading.Thread(target=lambda: [buffer.put(item) for item in range(5)])
+    producer.start()
+    received = [buffer.get() for _ in range(5)]
+    producer.join(timeout=5)
+    assert received == list(range(5))
+    assert buffer.dropped == 0
@@ -0,0 +1,230 @@
+import random
+
+import pytest
+
+from logic import (BACKENDS, BATCH_BACKENDS, MAYBE, NO, YES, And, AtLeastK, AtMostK, Biconditional, ExactlyOne,
+                   Implication, KnowledgeBase, Not, Or, SATSolver, Symbol, compile_bdd, count_models, decode_model,
+                   entails_many, iter_models, load_kb, marginals, model_check, parse, save_kb, simplify, to_cnf)
+from logic import _evaluate_model_check
+
+SYMBOLS = [Symbol(name) for name in "abcde"]
+
+
+def random_sentence(rng, depth=3):
+    if depth == 0 or rng.random() < 0.25: return rng.choice(SYMBOLS)
+    kind = rng.randrange(8)
+    children = lambda: [random_sentence(rng, depth - 1) for _ in range(rng.randrange(4))]
+    if kind == 0: return Not(random_sentence(rng, depth - 1))
+    if kind == 1: return And(*children())
+    if kind == 2: return Or(*children())
+    if kind == 3: return Implication(random_sentence(rng, depth - 1), random_sentence(rng, depth - 1))
+    if kind == 4: return Biconditional(random_sentence(rng, depth - 1), random_sentence(rng, depth - 1))
+    if kind == 5: return ExactlyOne(*children())
+    if kind == 6: return AtMostK(rng.randrange(4), *children())
+    return AtLeastK(rng.randrange(4), *children())
+
+
+def random_knowledge(count, seed=0):
+    rng = random.Random(seed)
+    return [And(*[random_sentence(rng) for _ in range(rng.randrange(1, 4))]) for _ in range(count)]
+
+
+def models(sentence):
+    return [mask for mask in range(1 << len(SYMBOLS)) if sentence.evaluate(decode_model(mask, SYMBOLS), cache=False)]
+
+
+def implication_chain(n):
+    x = [Symbol(f"x{i}") for i in range(n)]
+    deep = x[-1]
+    for s in reversed(x[:-1]): deep = Implication(s, deep)
+    return x, deep
+
+def test_sentences_accept_keyword_arguments():
+    a, b = Symbol("a"), Symbol("b")
+    assert Symbol(name="a") is a
+    assert Implication(antecedent=a, consequent=b) is Implication(a, b)
+
+
+def test_kb_round_trip_with_empty_cnf(tmp_path):
+    path = tmp_path / "empty.kb"
+    save_kb(path, [Symbol("a"), Symbol("b")], to_cnf(And()))
+    with load_kb(path) as kb:
+        assert kb.symbols == ["a", "b"]
+        assert kb.sentences() == [Symbol("a"), Symbol("b")]
+        assert kb.num_vars == 0
+
+
+def test_kb_round_trip_with_cnf(tmp_path):
+    a, b = Symbol("a"), Symbol("b")
+    cnf = to_cnf(a | ~b)
+    path = tmp_path / "kb.kb"
+    save_kb(path, [a | ~b], cnf)
+    with load_kb(path) as kb:
+        assert kb.sentences() == [a | ~b]
+        loaded = kb.cnf()
+        assert loaded.variables == cnf.variables
+        assert list(loaded.literals) == list(cnf.literals)
+
+
+@pytest.mark.parametrize("data", [b"", b"LGKB", b"NOPE" + bytes(40), b"LGKB" + (99).to_bytes(4, "little") + bytes(36)])
+def test_load_kb_rejects_malformed_files(tmp_path, data):
+    path = tmp_path / "bad.kb"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        load_kb(path)
+
+
+def test_load_kb_rejects_truncated_files(tmp_path):
+    path = tmp_path / "kb.kb"
+    save_kb(path, [Symbol("a") | ~Symbol("b")])
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        load_kb(path)
+
+
+def test_backtrack_handles_deep_formulas():
+    x, deep = implication_chain(1200)
+    assert deep.evaluate_partial({}) is None
+    assert deep.evaluate_partial({"x0": False}) is True
+    assert not model_check(deep, x[0], x, "backtrack")
+
+
+def test_tseitin_encoding_handles_deep_formulas():
+    x, deep = implication_chain(1200)
+    solver = SATSolver()
+    assert solver.add_cnf(to_cnf(deep))
+    assert solver.solve()
+    assert not model_check(deep, x[-1], x, "sat")
+
+
+def test_compile_handles_deep_formulas():
+    x, deep = implication_chain(1200)
+    evaluate = deep.compile(x)
+    assert evaluate([False] * 1200)
+    assert not evaluate([True] * 1199 + [False])
+
+
+def test_counting_handles_deep_formulas():
+    x, deep = implication_chain(1200)
+    assert count_models(deep, x) == (1 << 1200) - 1
+    first = next(iter_models(deep, x))
+    assert deep.evaluate_partial(decode_model(first, x)) is True
+
+
+def test_parse_handles_deep_formulas():
+    _, deep = implication_chain(1200)
+    assert parse(deep.formula()) is deep
+
+
+def test_simplify_handles_deep_formulas():
+    x, deep = implication_chain(1200)
+    assert simplify(And(*x[:-1], deep)) is And(*x)
+
+
+def test_knowledge_base_adds_deep_formulas():
+    x, deep = implication_chain(1200)
+    kb = KnowledgeBase(*x)
+    assert kb.ask(x[0]) == YES
+    kb.add(deep)
+    assert len(kb.sentences) == 1201
+    assert kb.ask(deep) == YES
+
+
+def test_star_import_exports_the_public_api():
+    namespace = {}
+    exec("from logic import *", namespace)
+    assert {"Symbol", "model_check", "parse", "to_cnf", "count_models", "KnowledgeBase", "compile_bdd", "profile"} <= namespace.keys()
+    assert not {"importlib", "inspect", "OrderedDict", "WeakValueDictionary"} & namespace.keys()
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backends_agree_with_evaluation(backend):
+    rng = random.Random(1)
+    for knowledge in random_knowledge(40):
+        query = random_sentence(rng, 2)
+        assert model_check(knowledge, query, SYMBOLS, backend) == _evaluate_model_check(knowledge, query, SYMBOLS)
+
+
+@pytest.mark.parametrize("backend", sorted(BATCH_BACKENDS))
+def test_batch_backends_agree_with_evaluation(backend):
+    rng = random.Random(2)
+    for knowledge in random_knowledge(20, seed=2):
+        queries = [random_sentence(rng, 2) for _ in range(4)]
+        expected = [YES if _evaluate_model_check(knowledge, q, SYMBOLS)
+                    else NO if _evaluate_model_check(knowledge, Not(q), SYMBOLS) else MAYBE for q in queries]
+        verdicts = entails_many(knowledge, queries, SYMBOLS, backend)
+        assert [verdicts[q] for q in queries] == expected
+
+
+@pytest.mark.parametrize("mode", ["tseitin", "distribute"])
+def test_cnf_preserves_satisfiability(mode):
+    for knowledge in random_knowledge(40, seed=3):
+        solver = SATSolver()
+        satisfiable = solver.add_cnf(to_cnf(knowledge, mode)) and solver.solve()
+        assert satisfiable == bool(models(knowledge))
+
+
+def test_distributed_cnf_is_equivalent():
+    for knowledge in random_knowledge(40, seed=4):
+        cnf = to_cnf(knowledge, "distribute")
+        for mask in range(1 << len(SYMBOLS)):
+            model = decode_model(mask, SYMBOLS)
+            values = {var: model[name] for name, var in cnf.variables.items()}
+            holds = all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in cnf.clauses())
+            assert holds == knowledge.evaluate(model, cache=False)
+
+
+def test_parse_round_trips_formulas():
+    rng = random.Random(5)
+    for _ in range(200):
+        sentence = random_sentence(rng, 4)
+        parsed = parse(sentence.formula())
+        assert parse(parsed.formula()) is parsed
+        assert models(parsed) == models(sentence)
+
+
+def test_simplify_preserves_models():
+    for knowledge in random_knowledge(100, seed=6):
+        assert models(simplify(knowledge)) == models(knowledge)
+
+
+def test_count_and_iter_models_match_enumeration():
+    for knowledge in random_knowledge(60, seed=7):
+        expected = models(knowledge)
+        assert count_models(knowledge, SYMBOLS) == len(expected)
+        assert sorted(iter_models(knowledge, SYMBOLS)) == expected
+
+
+def test_bdd_entailment_and_marginals():
+    rng = random.Random(8)
+    for knowledge in random_knowledge(40, seed=8):
+        compiled = compile_bdd(knowledge)
+        queries = [random_sentence(rng, 2) for _ in range(4)]
+        assert [compiled.entails(q) for q in queries] == [_evaluate_model_check(knowledge, q, SYMBOLS) for q in queries]
+        satisfying = models(knowledge)
+        assert compiled.count(SYMBOLS) == len(satisfying)
+        if not satisfying:
+            with pytest.raises(ValueError):
+                marginals(knowledge, all_symbols=SYMBOLS)
+            continue
+        expected = {s.name: sum(mask >> i & 1 for mask in satisfying) / len(satisfying) for i, s in enumerate(SYMBOLS)}
+        assert marginals(knowledge, all_symbols=SYMBOLS) == pytest.approx(expected)
+
+
+def test_knowledge_base_push_and_pop():
+    a, b, c = SYMBOLS[:3]
+    kb = KnowledgeBase(Implication(a, b))
+    assert kb.ask(b) == MAYBE
+    kb.push()
+    kb.add(a)
+    assert kb.ask(b) == YES
+    kb.push()
+    kb.add(Not(b))
+    assert not kb.satisfiable()
+    kb.pop()
+    assert kb.satisfiable() and kb.ask(b) == YES
+    kb.pop()
+    assert kb.ask(b) == MAYBE and kb.ask(c) == MAYBE
+    assert kb.sentences == [Implication(a, b)]
+    with pytest.raises(IndexError):
+        kb.pop()